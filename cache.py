@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Review Response Cache
+
+Stores reviewer responses in a local SQLite database keyed by a hash of the
+model, system prompt and user prompt. Reviewing the exact same code again
+within the TTL returns the stored response without calling the API.
+
+An optional second tier (semantic cache) embeds prompts with a small
+sentence-transformers model and reuses a stored response when a new prompt
+is nearly identical to an earlier one, e.g. after a whitespace or comment
+edit. The model only reads the first 256 tokens of its input, so prompts are
+embedded in chunks and every chunk has to match. It needs the optional
+sentence-transformers package.
+
+The cache is best-effort: any database or filesystem error is treated as a
+miss.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from typing import Optional
+
+from config_loader import CACHE_DIR
+
+CACHE_PATH = CACHE_DIR / "reviews.sqlite"
+
+# Seconds a cached review stays valid
+DEFAULT_TTL = int(os.getenv("REVIEW_CACHE_TTL", "3600"))
+
+# Cosine similarity above which the semantic cache treats prompts as the same
+SEMANTIC_TAU = float(os.getenv("REVIEW_SEM_TAU", "0.87"))
+SEMANTIC_MODEL = "all-MiniLM-L6-v2"
+# Newest entries kept per model/system prompt pair; older ones are evicted
+SEMANTIC_MAX_ENTRIES = 500
+# Characters per embedded chunk, kept under the model's 256 token window
+SEMANTIC_CHUNK_CHARS = 600
+
+_conn: Optional[sqlite3.Connection] = None
+_encoder = None
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database once per process, creating it if needed."""
+    global _conn
+    if _conn is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH, isolation_level=None)
+        # WAL lets concurrent CLI invocations read while another one writes
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS reviews ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic_chunks ("
+            "key TEXT PRIMARY KEY, scope TEXT NOT NULL, chunks INTEGER NOT NULL, "
+            "embedding BLOB NOT NULL, response TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS semantic_chunks_scope "
+            "ON semantic_chunks (scope, chunks, created_at)"
+        )
+        _conn = conn
+    return _conn
+
+
+def cache_key(model: str, system: str, prompt: str) -> str:
+    """Hash everything that determines a review's output."""
+    return hashlib.sha256(f"{model}|{system}|{prompt}".encode()).hexdigest()
+
+
+def get_cached_response(key: str, ttl: int = DEFAULT_TTL) -> Optional[str]:
+    """Return the cached response for key if it is younger than ttl seconds."""
+    try:
+        row = _connect().execute(
+            "SELECT response FROM reviews WHERE key = ? AND created_at > ?",
+            (key, int(time.time()) - ttl)
+        ).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    return row[0] if row else None
+
+
+def store_response(key: str, response: str):
+    """Store a response under key, replacing any older entry."""
+    try:
+        _connect().execute(
+            "INSERT OR REPLACE INTO reviews (key, response, created_at) VALUES (?, ?, ?)",
+            (key, response, int(time.time()))
+        )
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def embed_texts(texts: list[str]):
+    """
+    Normalized embeddings of texts, one row each, or None if
+    sentence-transformers is missing.
+    """
+    global _encoder
+    if _encoder is None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            print("Warning: sentence-transformers is not installed; skipping similarity matching")
+            _encoder = False
+            return None
+        _encoder = SentenceTransformer(SEMANTIC_MODEL)
+    if _encoder is False:
+        return None
+    return _encoder.encode(texts, normalize_embeddings=True).astype("float32")
+
+
+def _chunks(text: str) -> list[str]:
+    """
+    Split text into pieces of at most SEMANTIC_CHUNK_CHARS on line
+    boundaries, starting a new piece at every file header of a diff.
+    """
+    chunks, current = [], ""
+    for line in text.splitlines(keepends=True):
+        if current and (line.startswith("diff --git ") or len(current) + len(line) > SEMANTIC_CHUNK_CHARS):
+            chunks.append(current)
+            current = ""
+        while len(line) > SEMANTIC_CHUNK_CHARS:
+            chunks.append(line[:SEMANTIC_CHUNK_CHARS])
+            line = line[SEMANTIC_CHUNK_CHARS:]
+        current += line
+    if current or not chunks:
+        chunks.append(current)
+    return chunks
+
+
+def _semantic_scope(model: str, system: str, anchor: str) -> str:
+    """Only prompts sent with the same model, system prompt and anchor may match."""
+    return hashlib.sha256(f"{model}|{system}|{anchor}".encode()).hexdigest()
+
+
+def get_similar_response(
+    model: str,
+    system: str,
+    prompt: str,
+    anchor: str = "",
+    tau: float = SEMANTIC_TAU,
+    ttl: int = DEFAULT_TTL
+) -> Optional[str]:
+    """
+    Return the stored response whose prompt is most similar, if every chunk
+    of it scores above tau against the matching chunk of prompt. Text in
+    anchor (e.g. the list of changed files) has to match exactly.
+    """
+    query = embed_texts(_chunks(prompt))
+    if query is None:
+        return None
+
+    import numpy as np
+
+    try:
+        rows = _connect().execute(
+            "SELECT embedding, response FROM semantic_chunks "
+            "WHERE scope = ? AND chunks = ? AND created_at > ?",
+            (_semantic_scope(model, system, anchor), len(query), int(time.time()) - ttl)
+        ).fetchall()
+    except (sqlite3.Error, OSError):
+        return None
+    if not rows:
+        return None
+
+    # Embeddings are normalized, so the dot product is the cosine similarity;
+    # an entry is only as close as its least similar chunk
+    stored = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32)
+    stored = stored.reshape(len(rows), len(query), -1)
+    scores = np.einsum("rcd,cd->rc", stored, query).min(axis=1)
+    best = int(scores.argmax())
+    return rows[best][1] if scores[best] >= tau else None
+
+
+def store_similar_response(model: str, system: str, prompt: str, response: str, anchor: str = ""):
+    """Store a response with its prompt chunk embeddings for later similarity lookups."""
+    embeddings = embed_texts(_chunks(prompt))
+    if embeddings is None:
+        return
+    scope = _semantic_scope(model, system, anchor)
+    try:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO semantic_chunks (key, scope, chunks, embedding, response, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (cache_key(model, system, f"{anchor}|{prompt}"), scope, len(embeddings),
+             embeddings.tobytes(), response, int(time.time()))
+        )
+        # Bound the scan in get_similar_response
+        conn.execute(
+            "DELETE FROM semantic_chunks WHERE scope = ? AND key NOT IN ("
+            "SELECT key FROM semantic_chunks WHERE scope = ? ORDER BY created_at DESC LIMIT ?)",
+            (scope, scope, SEMANTIC_MAX_ENTRIES)
+        )
+    except (sqlite3.Error, OSError):
+        pass
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Fast-path argument parsing for the review CLIs.
+
+Building an argparse parser costs a noticeable share of startup time for a
+one-shot CLI, so the common invocations are parsed by hand and everything
+else falls back to the full parser.
+"""
+
+from types import SimpleNamespace
+from typing import Optional
+
+
+def parse_fast_args(
+    argv: list[str],
+    flags: dict[str, tuple[str, bool]],
+    defaults: dict
+) -> Optional[SimpleNamespace]:
+    """
+    Parse argv using flags, a table of flag -> (dest, takes a value).
+
+    Returns a namespace of defaults updated from argv, or None if argv uses
+    anything outside the table (including --help) or a value is missing.
+    """
+    args = SimpleNamespace(**defaults)
+    it = iter(argv)
+    for arg in it:
+        if arg not in flags:
+            return None
+        dest, takes_value = flags[arg]
+        if takes_value:
+            value = next(it, None)
+            if value is None or value.startswith("-"):
+                return None
+            setattr(args, dest, value)
+        else:
+            setattr(args, dest, True)
+    return args
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Shared Anthropic clients for the review CLIs and the orchestrator.
+
+Every client is built on the SDK's own httpx client, so its default
+timeouts apply, with a larger keep-alive pool so repeated calls reuse
+connections. anthropic and httpx are imported inside the factories rather
+than at module level since they take a noticeable share of CLI startup time
+and --help or input errors never need them.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import anthropic
+
+_sync_client: Optional["anthropic.Anthropic"] = None
+_async_client: Optional["anthropic.AsyncAnthropic"] = None
+
+
+def _pool_limits():
+    import httpx
+
+    return httpx.Limits(max_keepalive_connections=16, max_connections=32)
+
+
+def get_sync_client() -> "anthropic.Anthropic":
+    """Return the process-wide synchronous client, creating it on first use."""
+    global _sync_client
+    if _sync_client is None:
+        import anthropic
+
+        _sync_client = anthropic.Anthropic(
+            http_client=anthropic.DefaultHttpxClient(limits=_pool_limits())
+        )
+    return _sync_client
+
+
+def new_async_client() -> "anthropic.AsyncAnthropic":
+    """
+    Create a pooled async client. Use it with `async with` so its
+    connections are closed when the event loop that opened them finishes.
+    """
+    import anthropic
+
+    return anthropic.AsyncAnthropic(
+        http_client=anthropic.DefaultAsyncHttpxClient(limits=_pool_limits())
+    )
+
+
+def get_client() -> "anthropic.AsyncAnthropic":
+    """
+    Return the process-wide async Anthropic client, creating it on first use.
+
+    Sharing one client lets every agent reuse the same HTTP connection pool
+    instead of opening new connections per agent.
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = new_async_client()
+    return _async_client
+
+
+async def close_client():
+    """Close the shared async client's connections, if it was ever created."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
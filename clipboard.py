@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Clipboard helpers for the review CLIs.
+
+Uses NSPasteboard directly through pyobjc when it is installed, avoiding a
+pbpaste/pbcopy process per clipboard operation. Falls back to those commands
+otherwise. Copying also works on Linux (wl-copy, xclip or xsel) and
+Windows (clip).
+"""
+
+import functools
+import subprocess
+import sys
+
+PLAIN_TEXT_TYPE = "public.utf8-plain-text"
+
+# Commands that copy their stdin to the clipboard, tried in order
+if sys.platform == "darwin":
+    COPY_COMMANDS = [["pbcopy"]]
+elif sys.platform == "win32":
+    COPY_COMMANDS = [["clip"]]
+else:
+    # Wayland first, then the two common X11 tools
+    COPY_COMMANDS = [
+        ["wl-copy"],
+        ["xclip", "-selection", "clipboard"],
+        ["xsel", "--clipboard", "--input"],
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _pasteboard():
+    """
+    The general NSPasteboard, or None without pyobjc. Imported on first use
+    because loading AppKit is slow and most runs never touch the clipboard.
+    """
+    try:
+        from AppKit import NSPasteboard
+    except ImportError:
+        return None
+    return NSPasteboard.generalPasteboard()
+
+
+def get_clipboard():
+    """Get content from macOS clipboard."""
+    pb = _pasteboard()
+    if pb is not None:
+        return pb.stringForType_(PLAIN_TEXT_TYPE)
+    try:
+        result = subprocess.run(['pbpaste'], capture_output=True, text=True)
+        return result.stdout
+    except:
+        return None
+
+
+def copy_to_clipboard(text: str) -> bool:
+    """
+    Replace the system clipboard contents with text. Prints a warning and
+    returns False if no clipboard tool worked.
+    """
+    pb = _pasteboard()
+    if pb is not None:
+        pb.clearContents()
+        pb.setString_forType_(text, PLAIN_TEXT_TYPE)
+        return True
+    # clip reads stdin in the console code page unless it starts with a UTF-16 BOM
+    if sys.platform == "win32":
+        data = ("\ufeff" + text).encode("utf-16-le")
+    else:
+        data = text.encode("utf-8")
+    for command in COPY_COMMANDS:
+        try:
+            subprocess.run(command, input=data, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return True
+        except (FileNotFoundError, subprocess.CalledProcessError):
+            continue
+    names = ", ".join(command[0] for command in COPY_COMMANDS)
+    print(f"⚠️  Could not copy to the clipboard (tried {names})")
+    return False
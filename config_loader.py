@@ -6,24 +6,36 @@ Loads project configuration from .claude-review.yaml in the target repository.
 Falls back to sensible defaults if no config exists.
 """
 
+import copy
+import functools
+import hashlib
 import os
+import pickle
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-DEFAULT_CONFIG = {
+
+# Read-only so callers can never mutate the shared defaults; load_project_config
+# hands out fresh mutable copies.
+DEFAULT_CONFIG = MappingProxyType({
     "name": "Project",
     "language": "general",
-    "patterns": [],
-    "review_focus": [
+    "patterns": (),
+    "review_focus": (
         "Code quality and best practices",
         "Error handling",
         "Performance considerations",
         "Security issues"
-    ]
-}
+    )
+})
 
 LANGUAGE_DEFAULTS = {
     "swift": {
@@ -62,80 +74,188 @@ LANGUAGE_DEFAULTS = {
 }
 
 
-def load_project_config(repo_path: str) -> dict:
-    """
-    Load project configuration from .claude-review.yaml in the repo.
+def _freeze(config: Mapping) -> Mapping:
+    """Read-only view of a flat config, with lists stored as tuples."""
+    return MappingProxyType({
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in config.items()
+    })
 
-    Args:
-        repo_path: Path to the git repository
 
-    Returns:
-        Configuration dictionary with project settings
+def _thaw(config: Mapping) -> dict:
+    """Fresh mutable dict from a frozen config, with tuples back as lists."""
+    return {
+        key: list(value) if isinstance(value, tuple) else value
+        for key, value in config.items()
+    }
+
+
+# DEFAULT_CONFIG with each language's defaults applied, computed once at import
+MERGED_DEFAULTS = {
+    "general": DEFAULT_CONFIG,
+    **{lang: _freeze({**DEFAULT_CONFIG, **lang_cfg}) for lang, lang_cfg in LANGUAGE_DEFAULTS.items()},
+}
+
+
+# Per-user cache directory shared by every process
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "claude-review"
+
+# Parsed .claude-review.yaml contents keyed by path -> (mtime_ns, size, config)
+_CONFIG_CACHE: "OrderedDict[str, tuple[int, int, dict]]" = OrderedDict()
+_CONFIG_CACHE_MAX = 100
+
+
+def _load_hashed_cache(raw: bytes) -> tuple[str, Optional[dict]]:
     """
-    config_path = Path(repo_path) / ".claude-review.yaml"
+    Look up a previous parse of these exact config bytes in CACHE_DIR.
 
-    # Start with defaults
-    config = DEFAULT_CONFIG.copy()
+    Returns the content hash (used as the cache key) and the cached config,
+    or None if this content has not been parsed before.
+    """
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    try:
+        with open(CACHE_DIR / f"config.{digest}.pkl", 'rb') as f:
+            data = pickle.load(f)
+    except Exception:
+        return digest, None
+    return digest, data if isinstance(data, dict) else None
+
+
+def _write_hashed_cache(digest: str, project_config: dict):
+    """Atomically store a parsed config under its content hash."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(project_config, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, CACHE_DIR / f"config.{digest}.pkl")
+    except Exception:
+        # Cache is best-effort; a failed write just means re-parsing next time
+        pass
+
+
+def _read_project_config(config_path: Path) -> dict:
+    """
+    Parse a project config file, reusing the last parse if it is unchanged.
 
-    # Try to load project-specific config
-    if config_path.exists():
-        try:
-            with open(config_path, 'r') as f:
-                project_config = yaml.safe_load(f) or {}
+    Entries are keyed by path and invalidated when the file's mtime (in
+    nanoseconds, so quick successive edits aren't missed) or size changes. A deep copy is returned so callers can mutate the result freely.
+    """
+    key = str(config_path)
+    stat = os.stat(config_path)
 
-            # Merge with defaults
-            config.update(project_config)
+    cached = _CONFIG_CACHE.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _CONFIG_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
 
-        except Exception as e:
-            print(f"Warning: Could not load {config_path}: {e}")
+    with open(config_path, 'rb') as f:
+        raw = f.read()
+    digest, project_config = _load_hashed_cache(raw)
+    if project_config is None:
+        project_config = yaml.load(raw, Loader=Loader) or {}
+        _write_hashed_cache(digest, project_config)
 
-    # Apply language-specific defaults if not overridden
-    language = config.get("language", "general")
-    if language in LANGUAGE_DEFAULTS and "patterns" not in config:
-        lang_defaults = LANGUAGE_DEFAULTS[language]
-        for key, value in lang_defaults.items():
-            if key not in config or not config[key]:
-                config[key] = value
+    _CONFIG_CACHE[key] = (stat.st_mtime_ns, stat.st_size, project_config)
+    _CONFIG_CACHE.move_to_end(key)
+    if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+        _CONFIG_CACHE.popitem(last=False)
 
-    return config
+    return copy.deepcopy(project_config)
 
 
-def build_review_prompt(config: dict, base_prompt: str) -> str:
+def load_project_config(repo_path: str) -> dict:
     """
-    Build a complete review prompt by injecting project-specific context.
+    Load project configuration from .claude-review.yaml in the repo.
 
     Args:
-        config: Project configuration dictionary
-        base_prompt: The base reviewer system prompt
+        repo_path: Path to the git repository
 
     Returns:
-        Complete system prompt with project context
+        Configuration dictionary with project settings
     """
+    config_path = Path(repo_path) / ".claude-review.yaml"
+
+    # Try to load project-specific config. A missing file is the common case,
+    # so let the first stat() report it rather than probing with exists().
+    try:
+        project_config = _read_project_config(config_path)
+        if not isinstance(project_config, dict):
+            raise ValueError("expected a mapping at the top level")
+    except FileNotFoundError:
+        project_config = {}
+    except Exception as e:
+        project_config = {}
+        print(f"Warning: Could not load {config_path}: {e}")
+
+    # Start from the defaults for the project's language, then apply overrides
+    language = project_config.get("language", "general")
+    config = _thaw(MERGED_DEFAULTS.get(language, DEFAULT_CONFIG))
+    config.update(project_config)
+
+    return config
+
+
+@functools.lru_cache(maxsize=32)
+def _render_review_prompt(
+    base_prompt: str,
+    name: Optional[str],
+    language: Optional[str],
+    patterns: tuple,
+    review_focus: tuple,
+) -> str:
+    """Render a review prompt from already-extracted config values."""
     prompt_parts = [base_prompt]
 
     # Add project name
-    if config.get("name") and config["name"] != "Project":
-        prompt_parts.append(f"\n## Project: {config['name']}")
+    if name and name != "Project":
+        prompt_parts.append(f"\n## Project: {name}")
 
     # Add language context
-    if config.get("language") and config["language"] != "general":
-        prompt_parts.append(f"\nLanguage/Framework: {config['language']}")
+    if language and language != "general":
+        prompt_parts.append(f"\nLanguage/Framework: {language}")
 
     # Add project-specific patterns
-    if config.get("patterns"):
+    if patterns:
         prompt_parts.append("\n## Project-Specific Patterns")
-        for pattern in config["patterns"]:
-            prompt_parts.append(f"- {pattern}")
+        prompt_parts += [f"- {pattern}" for pattern in patterns]
 
     # Add review focus areas
-    if config.get("review_focus"):
+    if review_focus:
         prompt_parts.append("\n## Review Focus Areas")
-        for focus in config["review_focus"]:
-            prompt_parts.append(f"- {focus}")
+        prompt_parts += [f"- {focus}" for focus in review_focus]
 
     return "\n".join(prompt_parts)
 
 
+def build_review_prompt(config: dict, base_prompt: str) -> str:
+    """
+    Build a complete review prompt by injecting project-specific context.
+
+    Rendered prompts are memoized on the base prompt and the config values
+    they use, so repeated calls with an unchanged config are lookups.
+
+    Args:
+        config: Project configuration dictionary
+        base_prompt: The base reviewer system prompt
+
+    Returns:
+        Complete system prompt with project context
+    """
+    args = (
+        base_prompt,
+        config.get("name"),
+        config.get("language"),
+        tuple(config.get("patterns") or ()),
+        tuple(config.get("review_focus") or ()),
+    )
+    try:
+        return _render_review_prompt(*args)
+    except TypeError:
+        # Unhashable values (e.g. mappings in a YAML list) can't be memoized
+        return _render_review_prompt.__wrapped__(*args)
+
+
 def load_team_perspectives(repo_path: str) -> list[dict]:
     """
     Load team review perspectives from project config.
@@ -150,12 +270,27 @@ def load_team_perspectives(repo_path: str) -> list[dict]:
     return None
 
 
+def load_env():
+    """
+    Load the tool's .env file into the environment.
+
+    python-dotenv is only imported when the file exists, so runs configured
+    purely through the environment don't pay for the import.
+    """
+    env_path = Path(__file__).with_name(".env")
+    if env_path.exists():
+        from dotenv import load_dotenv
+        load_dotenv(env_path)
+
+
+@functools.lru_cache(maxsize=1)
 def get_tool_path() -> str:
     """
     Get the path to the claude-review-agent tool installation.
 
     Checks CLAUDE_REVIEW_HOME environment variable first,
-    then falls back to common locations.
+    then falls back to common locations. The result is computed once
+    per process.
     """
     # Check environment variable
     env_path = os.environ.get("CLAUDE_REVIEW_HOME")
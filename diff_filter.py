@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Diff filtering shared by the diff-based review CLIs.
+
+Drops lockfiles, generated and vendored files from a unified diff and caps
+very long per-file diffs before they are sent to a reviewer.
+"""
+
+import codecs
+import fnmatch
+import re
+from pathlib import Path
+
+# Files whose diffs are noise for a reviewer
+DEFAULT_EXCLUDE_GLOBS = ("*.lock", "*.pbxproj", "Pods/**")
+
+# Git C-quotes paths with special characters: diff --git "a/caf\303\251.swift" "b/caf\303\251.swift"
+DIFF_HEADER_RE = re.compile(r'^diff --git (?:"a/(?:[^"\\]|\\.)*"|a/.*) (?:"b/((?:[^"\\]|\\.)*)"|b/(.*))$')
+
+
+def load_generated_globs(repo_path: str) -> list[str]:
+    """Patterns marked linguist-generated in the repo's .gitattributes."""
+    try:
+        lines = (Path(repo_path) / ".gitattributes").read_text().splitlines()
+    except OSError:
+        return []
+
+    globs = []
+    for line in lines:
+        fields = line.split()
+        if len(fields) > 1 and not fields[0].startswith("#"):
+            if any(attr in ("linguist-generated", "linguist-generated=true") for attr in fields[1:]):
+                globs.append(fields[0].lstrip("/"))
+    return globs
+
+
+def _unquote_path(path: str) -> str:
+    """Undo git's C-style quoting, where non-ASCII bytes are octal escapes."""
+    raw = codecs.decode(path.encode("utf-8"), "unicode_escape").encode("latin-1")
+    return raw.decode("utf-8", errors="replace")
+
+
+def filter_diff(
+    diff: str,
+    max_lines_per_file: int = 400,
+    exclude_globs: tuple[str, ...] = DEFAULT_EXCLUDE_GLOBS
+) -> str:
+    """
+    Shrink a diff before it is sent to the reviewer.
+
+    Files matching exclude_globs are replaced by a one-line note, and any
+    file whose hunks exceed max_lines_per_file keeps only its first and last
+    halves around a truncation marker.
+    """
+    sections = []
+    current = None
+    # Not splitlines(): that would also break lines on \r, \f and friends inside the code
+    for line in diff.removesuffix("\n").split("\n"):
+        if line.startswith("diff --git "):
+            current = [line]
+            sections.append(current)
+        elif current is None:
+            sections.append([line])
+        else:
+            current.append(line)
+
+    out = []
+    half = max(max_lines_per_file // 2, 1)
+    for section in sections:
+        match = DIFF_HEADER_RE.match(section[0])
+        if not match:
+            out.extend(section)
+            continue
+
+        path = _unquote_path(match.group(1)) if match.group(1) is not None else match.group(2)
+        if any(fnmatch.fnmatch(path, pattern) for pattern in exclude_globs):
+            out.append(f"... [diff omitted for excluded file: {path}]")
+            continue
+
+        first_hunk = next((i for i, l in enumerate(section) if l.startswith("@@")), len(section))
+        header, body = section[:first_hunk], section[first_hunk:]
+        # Never "truncate" a body no longer than the head and tail it would keep
+        if len(body) > max(max_lines_per_file, 2 * half):
+            body = body[:half] + [f"... [{len(body) - 2 * half} lines truncated] ..."] + body[-half:]
+        out.extend(header)
+        out.extend(body)
+
+    return "\n".join(out)
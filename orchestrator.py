@@ -7,16 +7,20 @@ iterating until the code is approved or max iterations are reached.
 """
 
 import argparse
+import asyncio
 import json
 import os
 import sys
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import anthropic
 from dotenv import load_dotenv
 
+from clients import get_client
+from verdict import is_approved
+
 load_dotenv()
 
 # Configuration
@@ -108,18 +112,39 @@ class Agent:
         self.name = name
         self.system_prompt = system_prompt
         self.model = model
-        self.client = anthropic.Anthropic()
+        self.client = get_client()
+
+    async def respond(
+        self,
+        messages: list[dict],
+        temperature: float = 0.3,
+        stop_on: Optional[str] = None
+    ) -> str:
+        """
+        Get a response from this agent.
 
-    def respond(self, messages: list[dict], temperature: float = 0.3) -> str:
-        """Get a response from this agent."""
-        response = self.client.messages.create(
+        The response is streamed. If stop_on is given and the response starts
+        with it, streaming stops as soon as that prefix has arrived and the
+        text received so far is returned.
+        """
+        chunks = []
+        async with self.client.messages.stream(
             model=self.model,
             max_tokens=4096,
             temperature=temperature,
             system=self.system_prompt,
             messages=messages
-        )
-        return response.content[0].text
+        ) as stream:
+            async for text in stream.text_stream:
+                chunks.append(text)
+                if stop_on:
+                    head = "".join(chunks).lstrip()
+                    if len(head) >= len(stop_on):
+                        if head.upper().startswith(stop_on):
+                            break
+                        # Prefix ruled out; read the rest without re-checking
+                        stop_on = None
+        return "".join(chunks)
 
 
 class Orchestrator:
@@ -145,7 +170,7 @@ class Orchestrator:
         if self.verbose:
             print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
 
-    def run(self, task: str, file_context: Optional[str] = None, max_iterations: int = MAX_ITERATIONS) -> dict:
+    async def run(self, task: str, file_context: Optional[str] = None, max_iterations: int = MAX_ITERATIONS) -> dict:
         """
         Run the developer-reviewer loop.
 
@@ -170,7 +195,7 @@ class Orchestrator:
 
             # Developer turn
             self.log("Developer is working...")
-            dev_response = self.developer.respond(developer_messages)
+            dev_response = await self.developer.respond(developer_messages)
             self.conversation_log.append({
                 "agent": "developer",
                 "iteration": iteration,
@@ -186,7 +211,9 @@ class Orchestrator:
                 "role": "user",
                 "content": f"Review this code submission:\n\n{dev_response}"
             }]
-            rev_response = self.reviewer.respond(reviewer_messages, temperature=0.2)
+            rev_response = await self.reviewer.respond(
+                reviewer_messages, temperature=0.2, stop_on="APPROVED"
+            )
             self.conversation_log.append({
                 "agent": "reviewer",
                 "iteration": iteration,
@@ -197,7 +224,7 @@ class Orchestrator:
                 print(f"\n--- Reviewer Response ---\n{rev_response[:500]}{'...' if len(rev_response) > 500 else ''}\n")
 
             # Check if approved
-            if rev_response.strip().upper().startswith("APPROVED"):
+            if is_approved(rev_response):
                 self.log("Code APPROVED!")
                 final_code = dev_response
                 return {
@@ -207,12 +234,16 @@ class Orchestrator:
                     "conversation_log": self.conversation_log
                 }
 
-            # Prepare feedback for next iteration
-            developer_messages.append({"role": "assistant", "content": dev_response})
-            developer_messages.append({
-                "role": "user",
-                "content": f"The reviewer has requested changes:\n\n{rev_response}\n\nPlease address this feedback and provide an updated implementation."
-            })
+            # Prepare feedback for next iteration. Only the task, the latest
+            # attempt and its review are sent; earlier rounds are superseded.
+            developer_messages = [
+                developer_messages[0],
+                {"role": "assistant", "content": dev_response},
+                {
+                    "role": "user",
+                    "content": f"The reviewer has requested changes:\n\n{rev_response}\n\nPlease address this feedback and provide an updated implementation."
+                },
+            ]
 
             self.log("Changes requested, continuing to next iteration...")
 
@@ -227,13 +258,53 @@ class Orchestrator:
         }
 
 
-def load_file_context(file_paths: list[str]) -> str:
-    """Load content from specified files."""
+# Default cap on how much of each context file is sent to the agents
+MAX_BYTES_PER_FILE = 64 * 1024
+
+# File contents keyed by (path, byte cap) -> (mtime_ns, size, text), reused while
+# unchanged. text is None for binary files. Least recently used entries are
+# dropped past _FILE_CACHE_MAX so a long-running server stays bounded.
+_FILE_CACHE: "OrderedDict[tuple[str, int], tuple[int, int, Optional[str]]]" = OrderedDict()
+_FILE_CACHE_MAX = 256
+
+
+def _read_context_file(path: str, max_bytes: int) -> Optional[str]:
+    """Read up to max_bytes of a text file, or return None if it looks binary."""
+    with open(path, 'rb') as f:
+        data = f.read(max_bytes + 1)
+    if b"\0" in data[:8192]:
+        return None
+    if len(data) <= max_bytes:
+        return data.decode("utf-8", errors="replace")
+    total = os.path.getsize(path)
+    text = data[:max_bytes].decode("utf-8", errors="ignore")
+    return f"{text}\n... [truncated {total - max_bytes} bytes]"
+
+
+def load_file_context(file_paths: list[str], max_bytes_per_file: int = MAX_BYTES_PER_FILE) -> str:
+    """
+    Load content from specified files, skipping duplicates, missing paths and
+    binary files. Each file is capped at max_bytes_per_file.
+    """
     context_parts = []
-    for path in file_paths:
-        p = Path(path)
-        if p.exists():
-            content = p.read_text()
+    for path in dict.fromkeys(file_paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+
+        key = (path, max_bytes_per_file)
+        cached = _FILE_CACHE.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            content = cached[2]
+        else:
+            content = _read_context_file(path, max_bytes_per_file)
+            _FILE_CACHE[key] = (stat.st_mtime_ns, stat.st_size, content)
+            if len(_FILE_CACHE) > _FILE_CACHE_MAX:
+                _FILE_CACHE.popitem(last=False)
+        _FILE_CACHE.move_to_end(key)
+
+        if content is not None:
             context_parts.append(f"// File: {path}\n{content}")
     return "\n\n".join(context_parts)
 
@@ -292,11 +363,11 @@ def main():
         verbose=not args.quiet
     )
 
-    result = orchestrator.run(
+    result = asyncio.run(orchestrator.run(
         task=args.task,
         file_context=file_context,
         max_iterations=args.max_iterations
-    )
+    ))
 
     # Output results
     if args.json:
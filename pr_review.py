@@ -27,12 +27,19 @@ import subprocess
 import sys
 from pathlib import Path
 
-import anthropic
-from dotenv import load_dotenv
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-from config_loader import load_project_config, build_review_prompt
+from clipboard import copy_to_clipboard
+from config_loader import load_env, load_project_config, build_review_prompt
 
-load_dotenv()
+load_env()
+
+# Upper bound on the diff sent to the reviewer
+MAX_DIFF_BYTES = int(os.getenv("MAX_DIFF_BYTES", "200000"))
 
 BASE_PR_REVIEWER_PROMPT = """You are an expert code reviewer performing a PR readiness check.
 
@@ -86,86 +93,190 @@ def run_cmd(cmd: list[str], cwd: str = None) -> tuple[str, int]:
     return result.stdout.strip(), result.returncode
 
 
+def run_cmd_bytes(cmd: list[str], cwd: str = None) -> tuple[bytes, int]:
+    """Run a command and return its raw stdout and return code, for JSON output."""
+    result = subprocess.run(cmd, capture_output=True, cwd=cwd)
+    return result.stdout, result.returncode
+
+
 def get_current_branch(repo_path: str) -> str:
     """Get the current git branch."""
     output, _ = run_cmd(["git", "rev-parse", "--abbrev-ref", "HEAD"], repo_path)
     return output
 
 
-def get_pr_for_branch(repo_path: str, branch: str) -> dict | None:
-    """Get PR details for the current branch using gh CLI."""
-    # Try to get PR number for this branch
-    output, code = run_cmd([
-        "gh", "pr", "view", branch,
-        "--json", "number,title,body,state,reviews,comments,statusCheckRollup"
-    ], repo_path)
-
-    if code != 0:
-        return None
-
-    try:
-        return json.loads(output)
-    except json.JSONDecodeError:
-        return None
-
-
-def get_pr_review_comments(repo_path: str, pr_number: int) -> list[dict]:
-    """Get review comments on the PR."""
-    output, code = run_cmd([
-        "gh", "api",
-        f"repos/:owner/:repo/pulls/{pr_number}/comments",
-        "--jq", '[.[] | {body: .body, path: .path, line: .line, user: .user.login, state: .state}]'
-    ], repo_path)
-
-    if code != 0:
-        return []
-
-    try:
-        return json.loads(output) if output else []
-    except json.JSONDecodeError:
-        return []
+# An open PR for the branch wins over newer closed or merged ones; if there
+# is none, the newest PR of any state is used
+PR_CONTEXT_QUERY = """
+query($owner: String!, $name: String!, $branch: String!) {
+  repository(owner: $owner, name: $name) {
+    open: pullRequests(headRefName: $branch, states: [OPEN], first: 1, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { ...PRContext }
+    }
+    latest: pullRequests(headRefName: $branch, first: 1, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes { ...PRContext }
+    }
+  }
+}
+
+fragment PRContext on PullRequest {
+  number
+  title
+  body
+  state
+  reviews(first: 50) {
+    nodes {
+      state
+      comments(first: 100) {
+        nodes { body path line author { login } }
+      }
+    }
+  }
+  comments(last: 5) {
+    nodes { body author { login } }
+  }
+  commits(last: 1) {
+    nodes {
+      commit {
+        statusCheckRollup {
+          contexts(first: 100) {
+            nodes {
+              __typename
+              ... on CheckRun { name status conclusion }
+              ... on StatusContext { context state }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
 
 
-def get_pr_issue_comments(repo_path: str, pr_number: int) -> list[dict]:
-    """Get issue-style comments on the PR."""
-    output, code = run_cmd([
-        "gh", "api",
-        f"repos/:owner/:repo/issues/{pr_number}/comments",
-        "--jq", '[.[] | {body: .body, user: .user.login}]'
-    ], repo_path)
+def _login(node: dict) -> str:
+    """Author login from a GraphQL node (authors can be null for deleted users)."""
+    return (node.get("author") or {}).get("login", "unknown")
 
-    if code != 0:
-        return []
 
-    try:
-        return json.loads(output) if output else []
-    except json.JSONDecodeError:
-        return []
+def _check_from_context(node: dict) -> dict:
+    """Normalize a CheckRun or StatusContext node to {name, state, conclusion}."""
+    if node.get("__typename") == "StatusContext":
+        state = (node.get("state") or "").lower()
+        conclusion = "failure" if state in ("failure", "error") else state
+        return {"name": node.get("context"), "state": state, "conclusion": conclusion}
+    return {
+        "name": node.get("name"),
+        "state": (node.get("status") or "").lower(),
+        "conclusion": (node.get("conclusion") or "").lower(),
+    }
 
 
-def get_ci_status(repo_path: str) -> list[dict]:
-    """Get CI check status for the current branch."""
-    output, code = run_cmd([
-        "gh", "pr", "checks",
-        "--json", "name,state,conclusion"
+def get_pr_for_branch(repo_path: str, branch: str) -> dict | None:
+    """
+    Get PR details for the branch with a single gh GraphQL query.
+
+    Besides number, title, body and state, the returned dict carries the
+    PR's review comments, latest issue comments and CI checks under
+    review_comments, issue_comments and ci_status, with the failing checks
+    also split out under failed_checks.
+    """
+    output, code = run_cmd_bytes([
+        "gh", "api", "graphql",
+        "-F", "owner={owner}",
+        "-F", "name={repo}",
+        "-f", f"branch={branch}",
+        "-f", f"query={PR_CONTEXT_QUERY}",
     ], repo_path)
 
     if code != 0:
-        return []
+        return None
 
     try:
-        return json.loads(output) if output else []
-    except json.JSONDecodeError:
-        return []
-
+        data = _json_loads(output)
+        repository = data["data"]["repository"]
+        nodes = repository["open"]["nodes"] or repository["latest"]["nodes"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return None
 
-def get_git_diff(repo_path: str, staged: bool = False) -> str:
-    """Get git diff for uncommitted changes."""
+    if not nodes:
+        return None
+    pr = nodes[0]
+
+    review_comments = [
+        {
+            "body": comment.get("body"),
+            "path": comment.get("path"),
+            "line": comment.get("line"),
+            "user": _login(comment),
+            "state": review.get("state"),
+        }
+        for review in pr["reviews"]["nodes"]
+        for comment in review["comments"]["nodes"]
+    ]
+    issue_comments = [
+        {"body": comment.get("body"), "user": _login(comment)}
+        for comment in pr["comments"]["nodes"]
+    ]
+
+    ci_status = []
+    failed_checks = []
+    for commit in pr["commits"]["nodes"]:
+        rollup = commit["commit"].get("statusCheckRollup")
+        if not rollup:
+            continue
+        for node in rollup["contexts"]["nodes"]:
+            check = _check_from_context(node)
+            ci_status.append(check)
+            if check["conclusion"] == "failure":
+                failed_checks.append(check)
+
+    return {
+        "number": pr.get("number"),
+        "title": pr.get("title"),
+        "body": pr.get("body"),
+        "state": pr.get("state"),
+        "review_comments": review_comments,
+        "issue_comments": issue_comments,
+        "ci_status": ci_status,
+        "failed_checks": failed_checks,
+    }
+
+
+def get_git_diff(repo_path: str, staged: bool = False, max_bytes: int = MAX_DIFF_BYTES) -> str:
+    """
+    Get git diff for uncommitted changes.
+
+    The diff is streamed from git and capped at max_bytes; anything beyond
+    that would exceed what is useful to send to the model anyway.
+    """
     cmd = ["git", "diff"]
     if staged:
         cmd.append("--staged")
-    output, _ = run_cmd(cmd, repo_path)
-    return output
+
+    buf = bytearray()
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=repo_path) as proc:
+        while len(buf) <= max_bytes:
+            chunk = proc.stdout.read(65536)
+            if not chunk:
+                break
+            buf += chunk
+        truncated = len(buf) > max_bytes
+        if truncated:
+            proc.kill()
+
+    if truncated:
+        # Cut at the last complete line within the limit
+        end = buf.rfind(b"\n", 0, max_bytes) + 1 or max_bytes
+        note = f"\n... [diff truncated at {end} bytes]"
+    else:
+        end = len(buf)
+        note = ""
+
+    # Trim trailing whitespace by index and decode once, without extra copies
+    while end and buf[end - 1] in b" \t\r\n":
+        end -= 1
+    return str(memoryview(buf)[:end], "utf-8", "replace") + note
 
 
 def get_changed_files(repo_path: str) -> list[str]:
@@ -174,37 +285,47 @@ def get_changed_files(repo_path: str) -> list[str]:
     return [f for f in output.split('\n') if f]
 
 
-def format_pr_context(pr_data: dict, review_comments: list, issue_comments: list, ci_status: list) -> str:
-    """Format all PR context into a readable string."""
-    parts = []
+def format_pr_context(
+    pr_data: dict,
+    review_comments: list,
+    issue_comments: list,
+    ci_status: list,
+    failed_checks: list,
+) -> str:
+    """
+    Format all PR context into a readable string.
 
+    failed_checks is the subset of ci_status whose conclusion is failure,
+    as computed once by get_pr_for_branch.
+    """
     # PR Info
-    parts.append(f"## PR #{pr_data.get('number')}: {pr_data.get('title')}")
+    parts = [f"## PR #{pr_data.get('number')}: {pr_data.get('title')}"]
     if pr_data.get('body'):
         parts.append(f"\n### PR Description\n{pr_data['body']}")
 
     # Review comments (code-specific feedback)
     if review_comments:
         parts.append("\n### Code Review Comments (to address)")
-        for i, comment in enumerate(review_comments, 1):
-            path = comment.get('path', 'general')
-            line = comment.get('line', '')
-            line_info = f" (line {line})" if line else ""
-            parts.append(f"{i}. **{path}{line_info}**: {comment.get('body', '')[:500]}")
+        parts.extend(
+            f"{i}. **{c.get('path', 'general')}{' (line ' + str(c['line']) + ')' if c.get('line') else ''}**: "
+            f"{c.get('body', '')[:500]}"
+            for i, c in enumerate(review_comments, 1)
+        )
 
     # Issue comments (general discussion)
-    if issue_comments:
+    recent_comments = issue_comments[-5:]  # Last 5 comments
+    if recent_comments:
         parts.append("\n### PR Discussion Comments")
-        for comment in issue_comments[-5:]:  # Last 5 comments
-            parts.append(f"- @{comment.get('user', 'unknown')}: {comment.get('body', '')[:300]}")
+        parts.extend(
+            f"- @{c.get('user', 'unknown')}: {c.get('body', '')[:300]}"
+            for c in recent_comments
+        )
 
     # CI Status
     if ci_status:
-        failed = [c for c in ci_status if c.get('conclusion') == 'failure']
-        if failed:
+        if failed_checks:
             parts.append("\n### CI Failures (need fixing)")
-            for check in failed:
-                parts.append(f"- ❌ {check.get('name')}")
+            parts.extend(f"- ❌ {check.get('name')}" for check in failed_checks)
         else:
             parts.append("\n### CI Status: ✅ All checks passing")
 
@@ -219,6 +340,9 @@ def review_with_pr_context(
     project_config: dict = None
 ) -> str:
     """Send everything to the reviewer."""
+    # Imported here so gh/git errors and --help don't pay for loading the SDK
+    import anthropic
+
     client = anthropic.Anthropic()
 
     # Build system prompt with project-specific context
@@ -278,20 +402,20 @@ def main():
         print(f"🔗 PR #{pr_number}: {pr_data.get('title')}")
 
         # Get all PR context
-        review_comments = get_pr_review_comments(repo_path, pr_number)
-        issue_comments = get_pr_issue_comments(repo_path, pr_number)
-        ci_status = get_ci_status(repo_path)
+        review_comments = pr_data["review_comments"]
+        issue_comments = pr_data["issue_comments"]
+        ci_status = pr_data["ci_status"]
+        failed_checks = pr_data["failed_checks"]
 
         if review_comments:
             print(f"💬 {len(review_comments)} review comment(s) to address")
         if ci_status:
-            failed = [c for c in ci_status if c.get('conclusion') == 'failure']
-            if failed:
-                print(f"❌ {len(failed)} CI check(s) failing")
+            if failed_checks:
+                print(f"❌ {len(failed_checks)} CI check(s) failing")
             else:
                 print("✅ CI checks passing")
 
-        pr_context = format_pr_context(pr_data, review_comments, issue_comments, ci_status)
+        pr_context = format_pr_context(pr_data, review_comments, issue_comments, ci_status, failed_checks)
     else:
         print("ℹ️  No PR found for this branch (reviewing without PR context)")
 
@@ -325,8 +449,8 @@ def main():
     print("\n" + "━" * 60)
 
     if args.copy:
-        subprocess.run(['pbcopy'], input=review.encode(), check=True)
-        print("(Copied to clipboard)")
+        if copy_to_clipboard(review):
+            print("(Copied to clipboard)")
 
     # Exit code
     if "READY TO COMMIT" in review:
@@ -12,22 +12,45 @@ Usage:
     # Review with a question
     python review.py --file path/to/file.swift --question "Is this thread-safe?"
 
+    # Review several files concurrently
+    python review.py --files a.swift b.swift c.swift
+
+    # Same, through the Message Batches API (slower, half the cost)
+    python review.py --batch --files a.swift b.swift c.swift
+
     # Review stdin (pipe from pbpaste, etc)
     pbpaste | python review.py
 """
 
-import argparse
+import asyncio
+import mmap
 import os
-import subprocess
 import sys
+import time
 from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Optional
 
-import anthropic
-from dotenv import load_dotenv
+from cache import (
+    cache_key,
+    get_cached_response,
+    get_similar_response,
+    store_response,
+    store_similar_response,
+)
+from cli_args import parse_fast_args
+from clients import get_sync_client, new_async_client
+from clipboard import copy_to_clipboard, get_clipboard
+from config_loader import load_env, load_project_config, build_review_prompt
+from verdict import is_approved
 
-from config_loader import load_project_config, build_review_prompt
+if TYPE_CHECKING:
+    import anthropic
 
-load_dotenv()
+load_env()
+
+# Largest file sent to the reviewer as-is; bigger files keep their head and tail
+MAX_BYTES = int(os.getenv("REVIEW_MAX_BYTES", "65536"))
 
 BASE_REVIEWER_PROMPT = """You are an expert code reviewer.
 
@@ -43,19 +66,37 @@ Response format:
 4. Max 5 issues per review - prioritize the most important"""
 
 
-def get_clipboard():
-    """Get content from macOS clipboard."""
-    try:
-        result = subprocess.run(['pbpaste'], capture_output=True, text=True)
-        return result.stdout
-    except:
-        return None
+def read_code_file(path: Path, max_bytes: int = MAX_BYTES) -> str:
+    """
+    Read a file for review, capped at max_bytes.
 
+    Larger files are mapped rather than read, and only their first and last
+    max_bytes / 2 bytes are decoded, around a note of how much was elided.
+    Pipes and other files that report a size of 0 or can't be mapped
+    (e.g. <(cmd) or /dev/stdin) are read as a stream instead.
+    """
+    with open(path, 'rb') as f:
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError("empty or unsized file")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            data = f.read()
+    try:
+        size = len(data)
+        if size <= max_bytes:
+            return data[:].decode('utf-8', 'replace')
+        half = max_bytes // 2
+        head = data[:half].decode('utf-8', 'replace')
+        tail = data[size - half:].decode('utf-8', 'replace')
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    return f"{head}\n…[{size - 2 * half} bytes elided]…\n{tail}"
 
-def review_code(code: str, question: str = None, project_config: dict = None) -> str:
-    """Send code to reviewer and get feedback."""
-    client = anthropic.Anthropic()
 
+def build_review_request(code: str, question: str = None, project_config: dict = None) -> tuple[str, str]:
+    """Build the (system prompt, user prompt) pair for reviewing code."""
     # Build system prompt with project-specific context
     if project_config:
         system = build_review_prompt(project_config, BASE_REVIEWER_PROMPT)
@@ -66,25 +107,240 @@ def review_code(code: str, question: str = None, project_config: dict = None) ->
     if question:
         prompt += f"\n\nSpecific question: {question}"
 
-    response = client.messages.create(
-        model=os.getenv("DEFAULT_MODEL", "claude-opus-4-6"),
+    return system, prompt
+
+
+def review_code(
+    code: str,
+    question: str = None,
+    project_config: dict = None,
+    use_cache: bool = True,
+    stream: bool = False,
+    semantic_cache: bool = False
+) -> str:
+    """
+    Send code to reviewer and get feedback.
+
+    With stream=True the review is also written to stdout as it arrives.
+    With semantic_cache=True a review of a near-identical earlier prompt
+    may be returned when there is no exact cache hit.
+    """
+    client = get_sync_client()
+    model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
+    system, prompt = build_review_request(code, question, project_config)
+
+    key = cache_key(model, system, prompt)
+    if use_cache:
+        cached = get_cached_response(key)
+        if cached is None and semantic_cache:
+            cached = get_similar_response(model, system, prompt)
+        if cached is not None:
+            if stream:
+                sys.stdout.write(cached)
+            return cached
+
+    with client.messages.stream(
+        model=model,
         max_tokens=2048,
         temperature=0.2,
-        system=system,
+        # The system prompt is identical across reviews; let the API cache it
+        system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+        messages=[{"role": "user", "content": prompt}]
+    ) as response_stream:
+        if stream:
+            for text in response_stream.text_stream:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+        review = response_stream.get_final_message().content[0].text
+    store_response(key, review)
+    if semantic_cache:
+        store_similar_response(model, system, prompt, review)
+    return review
+
+
+async def _review_one(
+    client: "anthropic.AsyncAnthropic",
+    model: str,
+    system: str,
+    prompt: str,
+    use_cache: bool
+) -> str:
+    """Review one prepared prompt on the async client."""
+    key = cache_key(model, system, prompt)
+    if use_cache:
+        cached = get_cached_response(key)
+        if cached is not None:
+            return cached
+
+    response = await client.messages.create(
+        model=model,
+        max_tokens=2048,
+        temperature=0.2,
+        system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
         messages=[{"role": "user", "content": prompt}]
     )
-    return response.content[0].text
+    review = response.content[0].text
+    store_response(key, review)
+    return review
 
 
-def main():
+def review_many(
+    codes: list[str],
+    question: str = None,
+    project_config: dict = None,
+    use_cache: bool = True
+) -> list[str]:
+    """
+    Review several pieces of code concurrently.
+
+    At most REVIEW_CONCURRENCY (default 6) requests are in flight at once.
+    Reviews are returned in the same order as codes. A request that fails
+    doesn't discard the others; its entry reports the error instead.
+    """
+    model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
+    requests = [build_review_request(code, question, project_config) for code in codes]
+    sem = asyncio.Semaphore(int(os.getenv("REVIEW_CONCURRENCY", "6")))
+
+    async def run() -> list:
+        async with new_async_client() as client:
+            async def bounded(system: str, prompt: str) -> str:
+                async with sem:
+                    return await _review_one(client, model, system, prompt, use_cache)
+
+            return await asyncio.gather(
+                *[bounded(system, prompt) for system, prompt in requests],
+                return_exceptions=True
+            )
+
+    return [
+        f"CHANGES_REQUESTED\n(Review failed: {result})" if isinstance(result, Exception) else result
+        for result in asyncio.run(run())
+    ]
+
+
+def review_batch(
+    codes: list[str],
+    question: str = None,
+    project_config: dict = None,
+    use_cache: bool = True
+) -> list[str]:
+    """
+    Review several pieces of code through the Message Batches API.
+
+    Batches are billed at half price but complete asynchronously, typically
+    within minutes. Cached reviews are reused and only the rest are submitted.
+    Reviews are returned in the same order as codes.
+    """
+    client = get_sync_client()
+    model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
+
+    reviews: list[Optional[str]] = [None] * len(codes)
+    keys = []
+    batch_requests = []
+    for i, code in enumerate(codes):
+        system, prompt = build_review_request(code, question, project_config)
+        key = cache_key(model, system, prompt)
+        keys.append(key)
+        if use_cache:
+            reviews[i] = get_cached_response(key)
+        if reviews[i] is None:
+            batch_requests.append({
+                "custom_id": f"file-{i}",
+                "params": {
+                    "model": model,
+                    "max_tokens": 2048,
+                    "temperature": 0.2,
+                    "system": [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            })
+
+    if not batch_requests:
+        return reviews
+
+    batch = client.messages.batches.create(requests=batch_requests)
+    print(f"Submitted batch {batch.id} ({len(batch_requests)} request(s))")
+
+    # Poll with backoff: 20s at first, growing to at most 60s between checks
+    delay = 20.0
+    while batch.processing_status != "ended":
+        time.sleep(delay)
+        delay = min(delay * 1.5, 60.0)
+        batch = client.messages.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        print(f"  ... {counts.succeeded + counts.errored + counts.canceled + counts.expired}"
+              f"/{len(batch_requests)} done")
+
+    for entry in client.messages.batches.results(batch.id):
+        i = int(entry.custom_id.removeprefix("file-"))
+        if entry.result.type == "succeeded":
+            reviews[i] = entry.result.message.content[0].text
+            store_response(keys[i], reviews[i])
+        else:
+            reviews[i] = f"CHANGES_REQUESTED\n(Batch request {entry.result.type}; no review available)"
+
+    return reviews
+
+
+# Flags the hand-rolled parser below understands: flag -> (dest, takes a value)
+FAST_FLAGS = {
+    "-c": ("clipboard", False),
+    "--clipboard": ("clipboard", False),
+    "-f": ("file", True),
+    "--file": ("file", True),
+    "--copy": ("copy", False),
+}
+
+
+def _fast_args(argv: list[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common invocations (--clipboard, --file X, --copy, stdin)
+    without building an argparse parser.
+
+    Returns None for anything else, including --help, so the caller can
+    fall back to the full parser.
+    """
+    if len(argv) > 3:
+        return None
+    return parse_fast_args(argv, FAST_FLAGS, dict(
+        file=None, files=None, batch=False, clipboard=False, question=None, repo=None,
+        copy=False, no_cache=False, semantic_cache=False, max_bytes=MAX_BYTES
+    ))
+
+
+def _build_parser():
+    import argparse
+
     parser = argparse.ArgumentParser(description="Quick code review tool")
     parser.add_argument("--file", "-f", help="File to review")
+    parser.add_argument("--files", nargs="+", help="Several files to review concurrently")
+    parser.add_argument("--batch", action="store_true", help="Review --files via the Message Batches API (half cost, slower)")
     parser.add_argument("--clipboard", "-c", action="store_true", help="Review clipboard content")
     parser.add_argument("--question", "-q", help="Specific question about the code")
     parser.add_argument("--repo", "-r", help="Repository path for loading project config")
     parser.add_argument("--copy", action="store_true", help="Copy result to clipboard")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the API, ignoring cached reviews")
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="Also reuse reviews of near-identical earlier code (needs sentence-transformers)"
+    )
+    parser.add_argument(
+        "--max-bytes",
+        type=int,
+        default=MAX_BYTES,
+        help=f"Max bytes of each file sent for review (default: {MAX_BYTES})"
+    )
+    return parser
 
-    args = parser.parse_args()
+
+def main():
+    args = _fast_args(sys.argv[1:])
+    if args is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+        if args.batch and not args.files:
+            parser.error("--batch requires --files")
 
     # Load project config if repo specified
     project_config = None
@@ -93,13 +349,40 @@ def main():
         if project_config.get("name") != "Project":
             print(f"📦 Project: {project_config.get('name')}")
 
+    # Several files: review them concurrently and report in the order given
+    if args.files:
+        paths = [Path(f) for f in args.files]
+        missing = [str(p) for p in paths if not p.exists()]
+        if missing:
+            print(f"File not found: {', '.join(missing)}")
+            sys.exit(1)
+
+        codes = [read_code_file(p, args.max_bytes) for p in paths]
+        if args.batch:
+            print("Batch mode: results ready in minutes, 50% cost.")
+            reviews = review_batch(codes, args.question, project_config, use_cache=not args.no_cache)
+        else:
+            print(f"Reviewing {len(paths)} files...")
+            reviews = review_many(codes, args.question, project_config, use_cache=not args.no_cache)
+        for path, review in zip(paths, reviews):
+            print("-" * 50)
+            print(f"📄 {path}")
+            print(review)
+        print("-" * 50)
+
+        if args.copy:
+            if copy_to_clipboard("\n\n".join(f"## {p}\n{r}" for p, r in zip(paths, reviews))):
+                print("(Copied to clipboard)")
+
+        sys.exit(0 if all(is_approved(review) for review in reviews) else 1)
+
     # Get code to review
     code = None
 
     if args.file:
         path = Path(args.file)
         if path.exists():
-            code = path.read_text()
+            code = read_code_file(path, args.max_bytes)
             print(f"Reviewing: {path}")
         else:
             print(f"File not found: {path}")
@@ -114,23 +397,31 @@ def main():
         code = sys.stdin.read()
         print("Reviewing stdin...")
     else:
-        print("No input provided. Use --file, --clipboard, or pipe content.")
-        parser.print_help()
+        print("No input provided. Use --file, --files, --clipboard, or pipe content.")
+        _build_parser().print_help()
         sys.exit(1)
 
     # Get review
     print("-" * 50)
-    review = review_code(code, args.question, project_config)
-    print(review)
+    # Stream to an interactive terminal; piped output gets the review in one piece
+    stream = sys.stdout.isatty()
+    review = review_code(
+        code, args.question, project_config,
+        use_cache=not args.no_cache, stream=stream, semantic_cache=args.semantic_cache
+    )
+    if stream:
+        print()
+    else:
+        print(review)
     print("-" * 50)
 
     # Copy to clipboard if requested
     if args.copy:
-        subprocess.run(['pbcopy'], input=review.encode(), check=True)
-        print("(Copied to clipboard)")
+        if copy_to_clipboard(review):
+            print("(Copied to clipboard)")
 
     # Exit code based on approval
-    sys.exit(0 if "APPROVED" in review else 1)
+    sys.exit(0 if is_approved(review) else 1)
 
 
 if __name__ == "__main__":
@@ -6,22 +6,52 @@ Run with: uvicorn server:app --reload
 Or: python server.py
 """
 
+import asyncio
+import base64
+import importlib.util
 import os
+import secrets
+import struct
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
+from clients import close_client
 from orchestrator import Orchestrator, load_file_context
 
 load_dotenv()
 
+
+# Orchestration tasks running on the event loop. Holding references keeps
+# them from being garbage collected mid-run.
+_running: set[asyncio.Task] = set()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cancel unfinished tasks and release the shared Anthropic connection pool on shutdown."""
+    yield
+    for task in _running:
+        task.cancel()
+    await asyncio.gather(*_running, return_exceptions=True)
+    await close_client()
+
+
 app = FastAPI(
     title="Claude Multi-Agent Orchestrator",
     description="API for autonomous code development and review",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    # orjson encodes large final_code strings much faster than stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # CORS for local development
@@ -33,8 +63,73 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory task storage (use Redis/DB in production)
-tasks = {}
+class TaskStore:
+    """
+    Bounded in-memory task storage (use Redis/DB in production).
+
+    Holds at most `cap` tasks and forgets tasks older than `ttl` seconds.
+    Every operation takes an asyncio.Lock so request handlers and background
+    tasks never interleave a read with a partial update.
+    """
+
+    def __init__(self, cap: int = 1000, ttl: float = 3600):
+        self.cap = cap
+        self.ttl = ttl
+        self._tasks: OrderedDict[str, dict] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    def _purge(self):
+        """Drop expired tasks. Entries are in creation order, so stop at the first live one."""
+        cutoff = time.time() - self.ttl
+        while self._tasks:
+            task_id, task = next(iter(self._tasks.items()))
+            if task["created_at"] >= cutoff:
+                break
+            del self._tasks[task_id]
+
+    async def set(self, task_id: str, task: dict):
+        """Add a new task, evicting the oldest ones beyond capacity."""
+        async with self._lock:
+            self._purge()
+            self._tasks[task_id] = {**task, "created_at": time.time()}
+            while len(self._tasks) > self.cap:
+                self._tasks.popitem(last=False)
+
+    async def update(self, task_id: str, **fields) -> bool:
+        """Update fields of an existing task. Returns False if it is gone."""
+        async with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                return False
+            task.update(fields)
+            return True
+
+    async def get(self, task_id: str) -> Optional[dict]:
+        """Return a snapshot of a task, or None if unknown or expired."""
+        async with self._lock:
+            self._purge()
+            task = self._tasks.get(task_id)
+            return dict(task) if task is not None else None
+
+    async def items(self) -> list[tuple[str, dict]]:
+        """Snapshot of all live tasks, oldest first."""
+        async with self._lock:
+            self._purge()
+            return [(task_id, dict(task)) for task_id, task in self._tasks.items()]
+
+
+tasks = TaskStore()
+
+
+def _new_id() -> str:
+    """
+    16-character task ID that sorts by creation time.
+
+    A nanosecond timestamp followed by 16 random bits, encoded with the
+    base32hex alphabet, whose characters sort in the same order as their values.
+    """
+    raw = struct.pack(">QH", time.time_ns(), secrets.randbits(16))
+    return base64.b32hexencode(raw).decode().lower()
 
 
 class TaskRequest(BaseModel):
@@ -59,40 +154,38 @@ class TaskResult(BaseModel):
     note: Optional[str] = None
 
 
-def run_orchestrator_task(task_id: str, request: TaskRequest):
+async def run_orchestrator_task(task_id: str, request: TaskRequest):
     """Background task to run the orchestrator."""
     try:
-        tasks[task_id]["status"] = "running"
+        await tasks.update(task_id, status="running")
 
         # Load file context
         file_context = None
         if request.files:
-            file_context = load_file_context(request.files)
+            file_context = await run_in_threadpool(load_file_context, request.files)
 
         # Run orchestrator
         orchestrator = Orchestrator(
             context_type=request.context_type,
             verbose=False
         )
-        result = orchestrator.run(
+        result = await orchestrator.run(
             task=request.task,
             file_context=file_context,
             max_iterations=request.max_iterations
         )
 
-        tasks[task_id].update({
-            "status": "completed",
-            "success": result["success"],
-            "iterations": result["iterations"],
-            "final_code": result["final_code"],
-            "note": result.get("note")
-        })
+        await tasks.update(
+            task_id,
+            status="completed",
+            success=result["success"],
+            iterations=result["iterations"],
+            final_code=result["final_code"],
+            note=result.get("note")
+        )
 
     except Exception as e:
-        tasks[task_id].update({
-            "status": "failed",
-            "note": str(e)
-        })
+        await tasks.update(task_id, status="failed", note=str(e))
 
 
 @app.get("/")
@@ -101,20 +194,21 @@ def root():
 
 
 @app.post("/api/orchestrate", response_model=TaskResponse)
-def start_orchestration(request: TaskRequest, background_tasks: BackgroundTasks):
+async def start_orchestration(request: TaskRequest):
     """
     Start an autonomous development-review loop.
     Returns immediately with a task_id to poll for results.
     """
-    import uuid
-    task_id = str(uuid.uuid4())[:8]
+    task_id = _new_id()
 
-    tasks[task_id] = {
+    await tasks.set(task_id, {
         "status": "queued",
         "request": request.model_dump()
-    }
+    })
 
-    background_tasks.add_task(run_orchestrator_task, task_id, request)
+    task = asyncio.create_task(run_orchestrator_task(task_id, request))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
 
     return TaskResponse(
         task_id=task_id,
@@ -124,7 +218,7 @@ def start_orchestration(request: TaskRequest, background_tasks: BackgroundTasks)
 
 
 @app.post("/api/orchestrate/sync", response_model=TaskResult)
-def orchestrate_sync(request: TaskRequest):
+async def orchestrate_sync(request: TaskRequest):
     """
     Run orchestration synchronously (blocks until complete).
     Use for short tasks or when you need immediate results.
@@ -132,14 +226,15 @@ def orchestrate_sync(request: TaskRequest):
     # Load file context
     file_context = None
     if request.files:
-        file_context = load_file_context(request.files)
+        # Disk reads go to the threadpool so polls keep being served meanwhile
+        file_context = await run_in_threadpool(load_file_context, request.files)
 
     # Run orchestrator
     orchestrator = Orchestrator(
         context_type=request.context_type,
         verbose=False
     )
-    result = orchestrator.run(
+    result = await orchestrator.run(
         task=request.task,
         file_context=file_context,
         max_iterations=request.max_iterations
@@ -156,12 +251,12 @@ def orchestrate_sync(request: TaskRequest):
 
 
 @app.get("/api/task/{task_id}", response_model=TaskResult)
-def get_task_status(task_id: str):
+async def get_task_status(task_id: str):
     """Get the status and result of a task."""
-    if task_id not in tasks:
+    task = await tasks.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    task = tasks[task_id]
     return TaskResult(
         task_id=task_id,
         status=task["status"],
@@ -173,11 +268,12 @@ def get_task_status(task_id: str):
 
 
 @app.get("/api/tasks")
-def list_tasks():
+async def list_tasks():
     """List all tasks and their statuses."""
+    # Plain dicts (no response_model) so polling skips Pydantic validation
     return {
         task_id: {"status": task["status"]}
-        for task_id, task in tasks.items()
+        for task_id, task in await tasks.items()
     }
 
 
@@ -185,4 +281,19 @@ if __name__ == "__main__":
     import uvicorn
     host = os.getenv("SERVER_HOST", "127.0.0.1")
     port = int(os.getenv("SERVER_PORT", "8000"))
-    uvicorn.run(app, host=host, port=port)
+    # Task state lives in this process, so each worker only sees its own tasks.
+    # Keep a single worker unless tasks move to a shared store.
+    workers = int(os.getenv("SERVER_WORKERS", "1"))
+    if workers > 1:
+        print(f"Warning: running {workers} workers; /api/task polling only works "
+              "if it reaches the worker that started the task")
+    # uvloop isn't available on Windows; fall back to asyncio's own loop there
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+    uvicorn.run(
+        "server:app",
+        host=host,
+        port=port,
+        loop=loop,
+        http="httptools",
+        workers=workers
+    )
@@ -21,18 +21,33 @@ Usage:
     python smart_review.py --repo /path/to/repo --context-file /tmp/cursor_context.txt
 """
 
-import argparse
 import os
 import subprocess
 import sys
 from pathlib import Path
-
-import anthropic
-from dotenv import load_dotenv
-
-from config_loader import load_project_config, build_review_prompt
-
-load_dotenv()
+from types import SimpleNamespace
+from typing import Optional
+
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+from cache import (
+    cache_key,
+    get_cached_response,
+    get_similar_response,
+    store_response,
+    store_similar_response,
+)
+from cli_args import parse_fast_args
+from clients import get_sync_client
+from clipboard import copy_to_clipboard
+from config_loader import load_env, load_project_config, build_review_prompt
+from diff_filter import DEFAULT_EXCLUDE_GLOBS, filter_diff, load_generated_globs
+from verdict import is_approved
+
+load_env()
 
 BASE_SMART_REVIEWER_PROMPT = """You are an expert code reviewer.
 
@@ -57,8 +72,62 @@ Then provide:
 Be concise. Focus on the CHANGES, not hypothetical issues in unchanged code."""
 
 
-def get_git_diff(repo_path: str, files: list[str] = None, staged: bool = False) -> str:
+def open_repo(repo_path: str):
+    """
+    Open the repository in-process with pygit2, if available.
+
+    Returns None when pygit2 is not installed or the repo can't be opened,
+    in which case the helpers below shell out to git instead.
+    """
+    if pygit2 is None:
+        return None
+    try:
+        return pygit2.Repository(repo_path)
+    except (pygit2.GitError, KeyError):
+        return None
+
+
+def _repo_diff(repo, staged: bool):
+    """Index-to-workdir diff, or HEAD-to-index diff when staged."""
+    if staged:
+        return repo.diff("HEAD", cached=True)
+    return repo.diff()
+
+
+def _root_relative(repo, repo_path: str, files: list[str]) -> list[str]:
+    """
+    Resolve files the way git -C repo_path does (relative to repo_path) and
+    express them relative to the repository root, where pygit2's paths are.
+    """
+    base = os.path.abspath(repo_path)
+    root = os.path.abspath(repo.workdir)
+    return [
+        Path(os.path.relpath(os.path.join(base, f), root)).as_posix()
+        for f in files
+    ]
+
+
+def _matches_paths(path: str, files: list[str]) -> bool:
+    """Whether path is one of files or inside one of them (git pathspec-style)."""
+    return any(f == "." or path == f or path.startswith(f.rstrip("/") + "/") for f in files)
+
+
+def get_git_diff(repo_path: str, files: list[str] = None, staged: bool = False, repo=None) -> str:
     """Get git diff for the repository."""
+    # A bare repository has no workdir to resolve --files against; let git do it
+    if repo is not None and (repo.workdir or not files):
+        try:
+            diff = _repo_diff(repo, staged)
+            if files:
+                root_files = _root_relative(repo, repo_path, files)
+                return "".join(
+                    patch.text for patch in diff
+                    if _matches_paths(patch.delta.new_file.path, root_files)
+                )
+            return diff.patch or ""
+        except (pygit2.GitError, KeyError, ValueError):
+            pass  # e.g. no HEAD yet; let git handle it
+
     cmd = ["git", "-C", repo_path, "diff"]
     if staged:
         cmd.append("--staged")
@@ -70,25 +139,52 @@ def get_git_diff(repo_path: str, files: list[str] = None, staged: bool = False)
     return result.stdout
 
 
-def get_changed_files(repo_path: str) -> list[str]:
+def get_changed_files(repo_path: str, repo=None) -> list[str]:
     """Get list of changed files."""
+    if repo is not None:
+        try:
+            return [delta.new_file.path for delta in _repo_diff(repo, staged=False).deltas]
+        except (pygit2.GitError, KeyError, ValueError):
+            pass
+
     cmd = ["git", "-C", repo_path, "diff", "--name-only"]
     result = subprocess.run(cmd, capture_output=True, text=True)
     files = result.stdout.strip().split('\n')
     return [f for f in files if f]  # Filter empty strings
 
 
-def get_staged_files(repo_path: str) -> list[str]:
+def get_staged_files(repo_path: str, repo=None) -> list[str]:
     """Get list of staged files."""
+    if repo is not None:
+        try:
+            return [delta.new_file.path for delta in _repo_diff(repo, staged=True).deltas]
+        except (pygit2.GitError, KeyError, ValueError):
+            pass
+
     cmd = ["git", "-C", repo_path, "diff", "--staged", "--name-only"]
     result = subprocess.run(cmd, capture_output=True, text=True)
     files = result.stdout.strip().split('\n')
     return [f for f in files if f]
 
 
-def review_diff(diff: str, context: str = None, files_changed: list[str] = None, project_config: dict = None) -> str:
-    """Send diff to reviewer with context."""
-    client = anthropic.Anthropic()
+def review_diff(
+    diff: str,
+    context: str = None,
+    files_changed: list[str] = None,
+    project_config: dict = None,
+    use_cache: bool = True,
+    stream: bool = False,
+    semantic_cache: bool = False
+) -> str:
+    """
+    Send diff to reviewer with context.
+
+    With stream=True the review is also written to stdout as it arrives.
+    With semantic_cache=True a review of a near-identical earlier diff
+    may be returned when there is no exact cache hit.
+    """
+    client = get_sync_client()
+    model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
 
     # Build system prompt with project-specific context
     if project_config:
@@ -96,30 +192,85 @@ def review_diff(diff: str, context: str = None, files_changed: list[str] = None,
     else:
         system_prompt = BASE_SMART_REVIEWER_PROMPT
 
-    # Build the prompt
+    # Build the prompt. The file list is stable while iterating on a change,
+    # so it goes first with a cache breakpoint; context and diff follow.
+    content = []
+
+    if files_changed:
+        content.append({
+            "type": "text",
+            "text": f"## Files Changed\n" + "\n".join(f"- {f}" for f in files_changed),
+            "cache_control": {"type": "ephemeral"},
+        })
+
     prompt_parts = []
 
     if context:
         prompt_parts.append(f"## Developer Context\n{context}")
 
-    if files_changed:
-        prompt_parts.append(f"## Files Changed\n" + "\n".join(f"- {f}" for f in files_changed))
-
     prompt_parts.append(f"## Git Diff\n```diff\n{diff}\n```")
 
-    prompt = "\n\n".join(prompt_parts)
-
-    response = client.messages.create(
-        model=os.getenv("DEFAULT_MODEL", "claude-opus-4-6"),
+    content.append({"type": "text", "text": "\n\n".join(prompt_parts)})
+
+    prompt = "\n\n".join(block["text"] for block in content)
+    key = cache_key(model, system_prompt, prompt)
+    if use_cache:
+        cached = get_cached_response(key)
+        if cached is None and semantic_cache:
+            cached = get_similar_response(model, system_prompt, prompt)
+        if cached is not None:
+            if stream:
+                sys.stdout.write(cached)
+            return cached
+
+    with client.messages.stream(
+        model=model,
         max_tokens=2048,
         temperature=0.2,
-        system=system_prompt,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response.content[0].text
-
+        system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+        messages=[{"role": "user", "content": content}]
+    ) as response_stream:
+        if stream:
+            for text in response_stream.text_stream:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+        review = response_stream.get_final_message().content[0].text
+    store_response(key, review)
+    if semantic_cache:
+        store_similar_response(model, system_prompt, prompt, review)
+    return review
+
+
+# Flags the hand-rolled parser below understands: flag -> (dest, takes a value)
+FAST_FLAGS = {
+    "-r": ("repo", True),
+    "--repo": ("repo", True),
+    "-s": ("staged", False),
+    "--staged": ("staged", False),
+    "-c": ("context", True),
+    "--context": ("context", True),
+    "--copy": ("copy", False),
+}
+
+
+def _fast_args(argv: list[str]) -> Optional[SimpleNamespace]:
+    """
+    Parse the common invocations (--repo X with --staged, --context or
+    --copy) without building an argparse parser.
+
+    Returns None for anything else, including --help or a missing --repo,
+    so the caller can fall back to the full parser.
+    """
+    args = parse_fast_args(argv, FAST_FLAGS, dict(
+        repo=None, files=None, staged=False, context=None, context_file=None, copy=False,
+        no_cache=False, semantic_cache=False, max_diff_lines=400, exclude=None
+    ))
+    return args if args and args.repo else None
+
+
+def _build_parser():
+    import argparse
 
-def main():
     parser = argparse.ArgumentParser(description="Smart git-diff based code review")
     parser.add_argument("--repo", "-r", required=True, help="Path to git repository")
     parser.add_argument("--files", "-f", nargs="*", help="Specific files to review (optional)")
@@ -127,8 +278,19 @@ def main():
     parser.add_argument("--context", "-c", help="Context string explaining what was done")
     parser.add_argument("--context-file", help="File containing context")
     parser.add_argument("--copy", action="store_true", help="Copy result to clipboard")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the API, ignoring cached reviews")
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="Also reuse reviews of near-identical earlier diffs (needs sentence-transformers)"
+    )
+    parser.add_argument("--max-diff-lines", type=int, default=400, help="Max diff lines kept per file (default: 400)")
+    parser.add_argument("--exclude", action="append", help="Glob of files to leave out of the diff (repeatable)")
+    return parser
 
-    args = parser.parse_args()
+
+def main():
+    args = _fast_args(sys.argv[1:]) or _build_parser().parse_args()
 
     repo_path = os.path.expanduser(args.repo)
 
@@ -139,8 +301,13 @@ def main():
     elif not sys.stdin.isatty():
         context = sys.stdin.read().strip()
 
-    # Get the diff
-    diff = get_git_diff(repo_path, args.files, args.staged)
+    # Open the repo once and share it across the git helpers
+    repo = open_repo(repo_path)
+
+    # Get the diff, dropping generated/vendored files and capping huge ones
+    diff = get_git_diff(repo_path, args.files, args.staged, repo)
+    exclude_globs = (*DEFAULT_EXCLUDE_GLOBS, *load_generated_globs(repo_path), *(args.exclude or []))
+    diff = filter_diff(diff, args.max_diff_lines, exclude_globs)
 
     if not diff.strip():
         print("No changes detected. Nothing to review.")
@@ -154,9 +321,9 @@ def main():
 
     # Get list of changed files for context
     if args.staged:
-        files_changed = get_staged_files(repo_path)
+        files_changed = get_staged_files(repo_path, repo)
     else:
-        files_changed = args.files or get_changed_files(repo_path)
+        files_changed = args.files or get_changed_files(repo_path, repo)
 
     print(f"📋 Reviewing changes in: {', '.join(files_changed)}")
     if context:
@@ -164,17 +331,25 @@ def main():
     print("━" * 50)
 
     # Get review
-    review = review_diff(diff, context, files_changed, project_config)
-    print(review)
+    # Stream to an interactive terminal; piped output gets the review in one piece
+    stream = sys.stdout.isatty()
+    review = review_diff(
+        diff, context, files_changed, project_config,
+        use_cache=not args.no_cache, stream=stream, semantic_cache=args.semantic_cache
+    )
+    if stream:
+        print()
+    else:
+        print(review)
     print("━" * 50)
 
     # Copy to clipboard if requested
     if args.copy:
-        subprocess.run(['pbcopy'], input=review.encode(), check=True)
-        print("(Copied to clipboard)")
+        if copy_to_clipboard(review):
+            print("(Copied to clipboard)")
 
     # Exit code based on approval
-    sys.exit(0 if "APPROVED" in review else 1)
+    sys.exit(0 if is_approved(review) else 1)
 
 
 if __name__ == "__main__":
@@ -2,8 +2,9 @@
 """
 Multi-Perspective Team Review Tool
 
-Runs multiple specialized reviewer agents in parallel, each examining code
-from a different angle, then synthesizes their findings into a unified report.
+Runs multiple specialized reviewers, each examining code from a different
+angle, then synthesizes their findings into a unified report. By default all
+perspectives are answered in one API call; --parallel makes one call each.
 
 Default perspectives (iOS-focused):
 1. iOS Architect - Swift patterns, MVVM/data flow, navigation, async/await
@@ -17,23 +18,45 @@ Usage:
 
     # With additional context
     python team_review.py --repo /path/to/project --context "Refactored navigation stack"
+
+    # One API call per perspective
+    python team_review.py --repo /path/to/project --parallel
 """
 
 import argparse
+import asyncio
+import hashlib
+import io
+import json
 import os
+import re
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from typing import Optional
 
 import anthropic
 from dotenv import load_dotenv
 
-from config_loader import load_project_config, build_review_prompt
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+from cache import (
+    cache_key,
+    embed_texts,
+    get_cached_response,
+    get_similar_response,
+    store_response,
+    store_similar_response,
+)
+from clipboard import copy_to_clipboard
+from config_loader import CACHE_DIR, load_project_config, build_review_prompt
+from diff_filter import DEFAULT_EXCLUDE_GLOBS, filter_diff, load_generated_globs
 from pr_review import (
     get_current_branch,
     get_pr_for_branch,
-    get_pr_review_comments,
-    get_pr_issue_comments,
-    get_ci_status,
     format_pr_context,
     get_git_diff,
     get_changed_files,
@@ -50,6 +73,8 @@ DEFAULT_PERSPECTIVES = [
             "navigation architecture, dependency injection, async/await correctness, "
             "proper use of actors, protocol-oriented design"
         ),
+        # Only run when a changed path contains one of these; no triggers means always run
+        "triggers": [".swift", ".m", ".h"],
         "system_prompt": """You are a senior iOS architect reviewing code changes.
 
 Your focus areas:
@@ -77,6 +102,7 @@ Response format:
             "animations, responsive layouts, Liquid Glass awareness, "
             "user experience quality"
         ),
+        "triggers": ["View", ".xib", ".storyboard", ".xcassets", ".strings", ".xcstrings"],
         "system_prompt": """You are an Apple design and UX specialist reviewing code changes.
 
 Your focus areas:
@@ -185,6 +211,72 @@ Brief 1-line summary of each reviewer's assessment.
 What to address before committing (if anything)."""
 
 
+COMBINED_REVIEW_PROMPT = """You are a review team of {count} specialized reviewers examining the same code changes.
+Each reviewer's brief is given in its own section below. Write one independent review per reviewer,
+staying strictly within that reviewer's focus and following its response format.
+
+{sections}
+
+Respond with ONLY a JSON object, no surrounding prose or code fences:
+{{"reviews": [{{"name": "<reviewer name exactly as given>", "review": "<that reviewer's full review as markdown>"}}, ...]}}
+Include exactly one entry per reviewer, in the order listed."""
+
+
+# Numbered list item starting a finding, e.g. "3. [critical] Force unwrap on line 12"
+FINDING_RE = re.compile(r"^\s*\d+[.)]\s+\S")
+
+# Cosine similarity above which findings from different perspectives are merged
+DEDUP_TAU = float(os.getenv("REVIEW_DEDUP_TAU", "0.92"))
+
+
+# One JSON line per API call with its token usage, for checking cache hit rates
+USAGE_LOG = CACHE_DIR / "usage.jsonl"
+
+# Usage of every API call made by this process, for the summary footer
+_usage: list[dict] = []
+
+
+def record_usage(step: str, model: str, response) -> dict:
+    """
+    Note the token usage of an API response and append it to USAGE_LOG.
+
+    Returns the recorded row. Logging is best-effort.
+    """
+    usage = response.usage
+    row = {
+        "ts": time.time(),
+        "tool": "team_review",
+        "step": step,
+        "model": model,
+        "stop_reason": response.stop_reason,
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+        "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None) or 0,
+        "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None) or 0,
+    }
+    _usage.append(row)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(USAGE_LOG, "a") as f:
+            f.write(json.dumps(row) + "\n")
+    except OSError:
+        pass
+    return row
+
+
+def usage_summary() -> Optional[str]:
+    """One-line token summary of this run's API calls, or None if none were made."""
+    if not _usage:
+        return None
+    cached = sum(row["cache_read_input_tokens"] for row in _usage)
+    total_input = sum(
+        row["input_tokens"] + row["cache_read_input_tokens"] + row["cache_creation_input_tokens"]
+        for row in _usage
+    )
+    output = sum(row["output_tokens"] for row in _usage)
+    return f"💰 input: {total_input:,} (cached {cached:,}), output: {output:,}"
+
+
 def load_team_perspectives(project_config: dict) -> list[dict]:
     """
     Load team review perspectives from project config or use defaults.
@@ -211,77 +303,393 @@ def load_team_perspectives(project_config: dict) -> list[dict]:
                 "name": name,
                 "focus": focus,
                 "system_prompt": system_prompt,
+                "triggers": p.get("triggers") or [],
             })
         return perspectives
     return DEFAULT_PERSPECTIVES
 
 
-def run_perspective_review(
-    perspective: dict,
+def build_user_content(
     diff: str,
     pr_context: str,
     files_changed: list[str],
     developer_context: str,
-    project_config: dict,
-) -> dict:
-    """Run a single perspective review. Called in parallel."""
-    client = anthropic.Anthropic()
-    model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
+) -> list[dict]:
+    """
+    Build the user message shared by every reviewer, once per run.
 
-    # Build the user prompt
-    prompt_parts = []
+    Static content comes first so reruns hit the prompt cache: the PR
+    context and diff are one cached block, the developer's notes and file
+    list trail uncached.
+    """
+    shared_parts = []
     if pr_context:
-        prompt_parts.append(pr_context)
+        shared_parts.append(pr_context)
+    shared_parts.append(f"\n## Git Diff\n```diff\n{diff}\n```")
+
+    trailing_parts = []
     if developer_context:
-        prompt_parts.append(f"\n## Developer Context\n{developer_context}")
-    prompt_parts.append(
-        f"\n## Files Changed\n" + "\n".join(f"- {f}" for f in files_changed)
+        trailing_parts.append(f"## Developer Context\n{developer_context}")
+    trailing_parts.append(
+        f"## Files Changed\n" + "\n".join(f"- {f}" for f in files_changed)
     )
-    prompt_parts.append(f"\n## Git Diff\n```diff\n{diff}\n```")
+
+    return [
+        {"type": "text", "text": "\n".join(shared_parts), "cache_control": {"type": "ephemeral"}},
+        {"type": "text", "text": "\n\n".join(trailing_parts)},
+    ]
+
+
+async def run_perspective_review(
+    client: anthropic.AsyncAnthropic,
+    perspective: dict,
+    user_content: list[dict],
+    project_config: dict,
+    use_cache: bool = True,
+) -> dict:
+    """
+    Run a single perspective review. Awaited concurrently for each perspective.
+
+    An identical earlier request within the cache TTL is answered from the
+    local response cache.
+    """
+    model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
 
     # Add project-specific context to system prompt
     system_prompt = perspective["system_prompt"]
     if project_config:
         system_prompt = build_review_prompt(project_config, system_prompt)
 
-    response = client.messages.create(
-        model=model,
-        max_tokens=2048,
-        temperature=0.2,
-        system=system_prompt,
-        messages=[{"role": "user", "content": "\n".join(prompt_parts)}],
-    )
+    key = cache_key(model, system_prompt, "\n\n".join(block["text"] for block in user_content))
+    review = get_cached_response(key) if use_cache else None
+    usage = None
+
+    if review is None:
+        response = await client.messages.create(
+            model=model,
+            max_tokens=2048,
+            temperature=0.2,
+            system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+            messages=[{"role": "user", "content": user_content}],
+        )
+        review = response.content[0].text
+        usage = record_usage(perspective["name"], model, response)
+        store_response(key, review)
 
     return {
         "name": perspective["name"],
         "focus": perspective["focus"],
-        "review": response.content[0].text,
+        "review": review,
+        "usage": usage,
     }
 
 
-def synthesize_reviews(reviews: list[dict], diff: str) -> str:
-    """Combine all perspective reviews into a unified report."""
-    client = anthropic.Anthropic()
+def _parse_combined_reviews(text: str, perspectives: list[dict]) -> list[dict]:
+    """
+    Parse the JSON answer of a combined review into per-perspective reviews.
+
+    Raises ValueError if the answer isn't the expected JSON or a reviewer is missing.
+    """
+    # Tolerate code fences or stray prose around the object
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("no JSON object in combined review")
+    data = _json_loads(text[start:end + 1])
+    entries = data.get("reviews") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError("combined review has no reviews list")
+
+    by_name = {
+        entry.get("name"): entry.get("review")
+        for entry in entries
+        if isinstance(entry, dict)
+    }
+    reviews = []
+    for perspective in perspectives:
+        review = by_name.get(perspective["name"])
+        if not isinstance(review, str):
+            raise ValueError(f"combined review is missing {perspective['name']}")
+        reviews.append({
+            "name": perspective["name"],
+            "focus": perspective["focus"],
+            "review": review,
+        })
+    return reviews
+
+
+def run_combined_review(
+    client: anthropic.Anthropic,
+    perspectives: list[dict],
+    user_content: list[dict],
+    project_config: dict,
+    use_cache: bool = True,
+) -> list[dict]:
+    """
+    Run every perspective in a single API call.
+
+    The diff and PR context are sent once instead of once per perspective.
+    Raises ValueError if the model's answer can't be split back into reviews,
+    and anthropic.APIError if the call itself fails.
+    """
+    model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
+
+    sections = "\n\n".join(
+        f"=== PERSPECTIVE: {p['name']} ===\n{p['system_prompt']}" for p in perspectives
+    )
+    system_prompt = COMBINED_REVIEW_PROMPT.format(count=len(perspectives), sections=sections)
+    if project_config:
+        system_prompt = build_review_prompt(project_config, system_prompt)
+
+    key = cache_key(model, system_prompt, "\n\n".join(block["text"] for block in user_content))
+    cached = get_cached_response(key) if use_cache else None
+    if cached is not None:
+        return _parse_combined_reviews(cached, perspectives)
+
+    # Streamed because the output budget grows with the number of perspectives,
+    # and the SDK rejects long non-streaming requests
+    with client.messages.stream(
+        model=model,
+        max_tokens=2048 * len(perspectives),
+        temperature=0.2,
+        system=[{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+        messages=[{"role": "user", "content": user_content}],
+    ) as response_stream:
+        response = response_stream.get_final_message()
+
+    text = response.content[0].text
+    record_usage("combined", model, response)
+    reviews = _parse_combined_reviews(text, perspectives)
+    # Only answers that parsed are worth replaying
+    store_response(key, text)
+    return reviews
+
+
+def run_parallel_reviews(
+    perspectives: list[dict],
+    user_content: list[dict],
+    project_config: dict,
+    use_cache: bool = True,
+) -> list[dict]:
+    """
+    Run each perspective as its own API call, concurrently on one event loop.
+
+    The calls share one async client, so they reuse its connection pool. At
+    most REVIEW_CONCURRENCY (default 4) are in flight at once, so projects
+    with many perspectives don't run into rate limits.
+    """
+    sem = asyncio.Semaphore(int(os.getenv("REVIEW_CONCURRENCY", "4")))
+
+    async def review_one(client: anthropic.AsyncAnthropic, perspective: dict) -> dict:
+        try:
+            async with sem:
+                result = await run_perspective_review(client, perspective, user_content, project_config, use_cache)
+        except Exception as e:
+            print(f"  ❌ {perspective['name']} review failed: {e}")
+            return None
+        print(f"  ✅ {perspective['name']} review complete")
+        return result
+
+    async def run() -> list[dict]:
+        async with anthropic.AsyncAnthropic() as client:
+            return await asyncio.gather(*[review_one(client, p) for p in perspectives])
+
+    return [result for result in asyncio.run(run()) if result is not None]
+
+
+def select_perspectives(perspectives: list[dict], files_changed: list[str]) -> list[dict]:
+    """
+    Keep the perspectives that apply to the changed files.
+
+    A perspective with triggers runs only if some changed path matches one
+    of them: triggers starting with "." are file extensions and must end
+    the path, others (e.g. "View") may appear anywhere in it. One without
+    triggers always runs. If nothing matches, every perspective runs rather
+    than none.
+    """
+    def matches(trigger: str, path: str) -> bool:
+        return path.endswith(trigger) if trigger.startswith(".") else trigger in path
+
+    selected = [
+        p for p in perspectives
+        if not p.get("triggers") or any(matches(t, f) for t in p["triggers"] for f in files_changed)
+    ]
+    return selected or perspectives
+
+
+def _finding_ranges(lines: list[str]) -> list[tuple[int, int]]:
+    """
+    Line ranges [start, end) of the numbered findings in a review.
+
+    A finding runs until the next numbered item, a heading, or a blank line
+    that isn't followed by an indented continuation.
+    """
+    starts = [i for i, line in enumerate(lines) if FINDING_RE.match(line)]
+    ranges = []
+    for n, start in enumerate(starts):
+        end = starts[n + 1] if n + 1 < len(starts) else len(lines)
+        for j in range(start + 1, end):
+            line = lines[j]
+            if line.lstrip().startswith("#"):
+                end = j
+                break
+            if not line.strip() and (j + 1 >= end or not lines[j + 1].startswith((" ", "\t"))):
+                end = j
+                break
+        ranges.append((start, end))
+    return ranges
+
+
+def dedupe_findings(reviews: list[dict], tau: float = DEDUP_TAU) -> list[dict]:
+    """
+    Merge near-identical findings reported by different perspectives.
+
+    Findings are embedded locally and linked when their cosine similarity is
+    at least tau. Each cluster keeps its longest finding, tagged with the
+    other perspectives that reported it; the rest are cut from their reviews.
+    Returns the reviews unchanged if sentence-transformers is missing.
+    """
+    split = [r["review"].splitlines() for r in reviews]
+    # (review index, start line, end line) for every finding
+    findings = [
+        (ri, start, end)
+        for ri, lines in enumerate(split)
+        for start, end in _finding_ranges(lines)
+    ]
+    if len(findings) < 2:
+        return reviews
+    texts = ["\n".join(split[ri][start:end]).strip() for ri, start, end in findings]
+    vectors = embed_texts(texts)
+    if vectors is None:
+        return reviews
+
+    # Single-linkage clustering over pairs from different perspectives
+    similarity = vectors @ vectors.T
+    parent = list(range(len(findings)))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(findings)):
+        for j in range(i + 1, len(findings)):
+            if findings[i][0] != findings[j][0] and similarity[i, j] >= tau:
+                parent[root(j)] = root(i)
+
+    clusters = {}
+    for i in range(len(findings)):
+        clusters.setdefault(root(i), []).append(i)
+
+    dropped = set()
+    also_reported = {}
+    for members in clusters.values():
+        if len(members) < 2:
+            continue
+        keep = max(members, key=lambda i: len(texts[i]))
+        keep_name = reviews[findings[keep][0]]["name"]
+        also_reported[keep] = sorted({reviews[findings[i][0]]["name"] for i in members} - {keep_name})
+        dropped.update(i for i in members if i != keep)
+    if not dropped:
+        return reviews
+
+    # Edit each review bottom-up so earlier line ranges stay valid
+    for i in sorted(dropped | also_reported.keys(), key=lambda i: (findings[i][0], -findings[i][1])):
+        ri, start, end = findings[i]
+        if i in dropped:
+            del split[ri][start:end]
+        else:
+            split[ri][start] += f" (also reported by: {', '.join(also_reported[i])})"
+
+    print(f"  🔗 Merged {len(dropped)} duplicate findings across perspectives")
+    return [{**r, "review": "\n".join(lines)} for r, lines in zip(reviews, split)]
+
+
+def synthesize_reviews(
+    client: anthropic.Anthropic,
+    reviews: list[dict],
+    diff: str,
+    stream: bool = False
+) -> str:
+    """
+    Combine all perspective reviews into a unified report.
+
+    With stream=True the report is also written to stdout as it arrives.
+    """
     model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
 
     perspective_names = ", ".join(r["name"] for r in reviews)
     system = SYNTHESIS_PROMPT.format(perspective_names=perspective_names)
 
-    # Build the synthesis input
+    # Build the synthesis input, with the reference diff first so it can be
+    # served from the prompt cache
+    diff_block = f"## Original Diff (for reference)\n```diff\n{diff[:3000]}\n```"
     parts = []
     for r in reviews:
         parts.append(f"## Review from: {r['name']}\nFocus: {r['focus']}\n\n{r['review']}")
 
-    parts.append(f"\n## Original Diff (for reference)\n```diff\n{diff[:3000]}\n```")
-
-    response = client.messages.create(
+    with client.messages.stream(
         model=model,
         max_tokens=3000,
         temperature=0.2,
-        system=system,
-        messages=[{"role": "user", "content": "\n\n---\n\n".join(parts)}],
-    )
-    return response.content[0].text
+        system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+        messages=[{"role": "user", "content": [
+            {"type": "text", "text": diff_block, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "\n\n---\n\n".join(parts)},
+        ]}],
+    ) as response_stream:
+        if stream:
+            for text in response_stream.text_stream:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            print()
+        message = response_stream.get_final_message()
+    record_usage("synthesis", model, message)
+    return message.content[0].text
+
+
+def run_team_review(
+    client: anthropic.Anthropic,
+    perspectives: list[dict],
+    user_content: list[dict],
+    diff: str,
+    project_config: dict,
+    parallel: bool = False,
+    use_cache: bool = True,
+    dedupe: bool = False,
+) -> tuple[list[dict], str]:
+    """
+    Run the perspective reviews and synthesize them. Exits if every review fails.
+
+    With dedupe=True, near-identical findings are merged before synthesis;
+    the returned reviews are always the originals.
+    """
+    review_args = (perspectives, user_content, project_config, use_cache)
+    if parallel:
+        reviews = run_parallel_reviews(*review_args)
+    else:
+        # One call sends the diff once; fall back to per-perspective calls
+        # if it fails or its answer can't be split back into reviews
+        try:
+            reviews = run_combined_review(client, *review_args)
+            for r in reviews:
+                print(f"  ✅ {r['name']} review complete")
+        except (ValueError, anthropic.APIError) as e:
+            print(f"  ⚠️  Combined review unusable ({e}); running perspectives separately")
+            reviews = run_parallel_reviews(*review_args)
+
+    if not reviews:
+        print("\n❌ All reviews failed. Check your API key and network.")
+        sys.exit(1)
+
+    to_synthesize = dedupe_findings(reviews) if dedupe else reviews
+
+    print(f"\n🔄 Synthesizing {len(reviews)} reviews...")
+    print("━" * 60 + "\n")
+
+    # Synthesize all reviews, showing the report as it is written
+    synthesis = synthesize_reviews(client, to_synthesize, diff, stream=True)
+    return reviews, synthesis
 
 
 def main():
@@ -290,8 +698,24 @@ def main():
     parser.add_argument("--context", "-c", help="What you just did (optional)")
     parser.add_argument("--staged", "-s", action="store_true", help="Review staged changes only")
     parser.add_argument("--copy", action="store_true", help="Copy result to clipboard")
-    import subprocess
-
+    parser.add_argument("--no-cache", action="store_true", help="Always call the API, ignoring cached reviews")
+    parser.add_argument("--max-diff-lines", type=int, default=400, help="Max diff lines kept per file (default: 400)")
+    parser.add_argument("--exclude", action="append", help="Glob of files to leave out of the diff (repeatable)")
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="Reuse the team review of a near-identical earlier diff (needs sentence-transformers)"
+    )
+    parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="Merge near-identical findings across perspectives before synthesis (needs sentence-transformers)"
+    )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="One API call per perspective instead of a single combined call"
+    )
     args = parser.parse_args()
     repo_path = os.path.expanduser(args.repo)
 
@@ -310,10 +734,11 @@ def main():
     if pr_data:
         pr_number = pr_data.get("number")
         print(f"🔗 PR #{pr_number}: {pr_data.get('title')}")
-        review_comments = get_pr_review_comments(repo_path, pr_number)
-        issue_comments = get_pr_issue_comments(repo_path, pr_number)
-        ci_status = get_ci_status(repo_path)
-        pr_context = format_pr_context(pr_data, review_comments, issue_comments, ci_status)
+        review_comments = pr_data["review_comments"]
+        issue_comments = pr_data["issue_comments"]
+        ci_status = pr_data["ci_status"]
+        failed_checks = pr_data["failed_checks"]
+        pr_context = format_pr_context(pr_data, review_comments, issue_comments, ci_status, failed_checks)
     else:
         print("ℹ️  No PR found for this branch (reviewing without PR context)")
 
@@ -329,66 +754,82 @@ def main():
         print("Make your changes first, then run this review before committing.")
         sys.exit(0)
 
+    # Drop lockfiles/generated files and cap huge per-file diffs before
+    # every reviewer is sent a copy
+    original_size = len(diff)
+    exclude_globs = (*DEFAULT_EXCLUDE_GLOBS, *load_generated_globs(repo_path), *(args.exclude or []))
+    diff = filter_diff(diff, args.max_diff_lines, exclude_globs)
+    print(f"✂️  Diff: {original_size:,} chars, {len(diff):,} after filtering")
+
     files_changed = get_changed_files(repo_path)
     print(f"📝 Changed files: {', '.join(files_changed)}")
 
-    # Load perspectives
-    perspectives = load_team_perspectives(project_config)
+    # Load perspectives, skipping those that don't apply to these files
+    all_perspectives = load_team_perspectives(project_config)
+    perspectives = select_perspectives(all_perspectives, files_changed)
+    for p in all_perspectives:
+        if p not in perspectives:
+            print(f"⏭️  Skipping {p['name']} (no matching files changed)")
     perspective_names = [p["name"] for p in perspectives]
     print(f"\n👥 Team Review: {', '.join(perspective_names)}")
     print("━" * 60)
 
-    # Run all perspective reviews in parallel
-    reviews = []
-    with ThreadPoolExecutor(max_workers=len(perspectives)) as executor:
-        future_to_name = {}
-        for perspective in perspectives:
-            future = executor.submit(
-                run_perspective_review,
-                perspective,
-                diff,
-                pr_context,
-                files_changed,
-                developer_context,
-                project_config,
+    # A near-identical diff (e.g. only whitespace changed) reuses the last team review
+    model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
+    cache_system = build_review_prompt(project_config, "\n\n".join(p["system_prompt"] for p in perspectives))
+    # Only the diff is embedded. The file set, developer notes, PR state
+    # (new comments, CI results) and review mode must match exactly.
+    cache_anchor = "\n\n".join([
+        "\n".join(sorted(files_changed)),
+        developer_context or "",
+        hashlib.sha256(pr_context.encode()).hexdigest(),
+        f"parallel={args.parallel} dedupe={args.dedupe}",
+    ])
+    cached = None
+    if args.semantic_cache and not args.no_cache:
+        cached = get_similar_response(model, cache_system, diff, anchor=cache_anchor)
+
+    if cached is not None:
+        cached = _json_loads(cached)
+        reviews, synthesis = cached["reviews"], cached["synthesis"]
+        print("  ♻️  Reusing the team review of a near-identical diff")
+        print("━" * 60 + "\n")
+        print(synthesis)
+    else:
+        # One client, and so one connection pool, for every call in this run
+        client = anthropic.Anthropic()
+        # Every reviewer gets the same user message, built once
+        user_content = build_user_content(diff, pr_context, files_changed, developer_context)
+        reviews, synthesis = run_team_review(
+            client, perspectives, user_content, diff, project_config,
+            parallel=args.parallel, use_cache=not args.no_cache, dedupe=args.dedupe
+        )
+        if args.semantic_cache:
+            store_similar_response(
+                model, cache_system, diff, json.dumps({"reviews": reviews, "synthesis": synthesis}),
+                anchor=cache_anchor
             )
-            future_to_name[future] = perspective["name"]
-
-        for future in as_completed(future_to_name):
-            name = future_to_name[future]
-            try:
-                result = future.result()
-                reviews.append(result)
-                print(f"  ✅ {name} review complete")
-            except Exception as e:
-                print(f"  ❌ {name} review failed: {e}")
-
-    if not reviews:
-        print("\n❌ All reviews failed. Check your API key and network.")
-        sys.exit(1)
 
-    print(f"\n🔄 Synthesizing {len(reviews)} reviews...")
-    print("━" * 60 + "\n")
+    summary = usage_summary()
+    if summary:
+        print(f"\n{summary}")
 
-    # Synthesize all reviews
-    synthesis = synthesize_reviews(reviews, diff)
-    print(synthesis)
-
-    print("\n" + "━" * 60)
-
-    # Print individual reviews in detail
-    print("\n📋 Individual Perspective Reviews:")
+    # Print individual reviews in detail, built up and written in one go
+    out = io.StringIO()
+    out.write("\n" + "━" * 60 + "\n")
+    out.write("\n📋 Individual Perspective Reviews:\n")
     for r in reviews:
-        print(f"\n{'─' * 40}")
-        print(f"👤 {r['name']} ({r['focus'][:60]}...)")
-        print(f"{'─' * 40}")
-        print(r["review"])
-
-    print("\n" + "━" * 60)
+        out.write(f"\n{'─' * 40}\n")
+        out.write(f"👤 {r['name']} ({r['focus'][:60]}...)\n")
+        out.write(f"{'─' * 40}\n")
+        out.write(r["review"] + "\n")
+    out.write("\n" + "━" * 60 + "\n")
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
 
     if args.copy:
-        subprocess.run(["pbcopy"], input=synthesis.encode(), check=True)
-        print("(Synthesis copied to clipboard)")
+        if copy_to_clipboard(synthesis):
+            print("(Synthesis copied to clipboard)")
 
     # Exit code based on synthesis verdict
     if "APPROVED" in synthesis and "CHANGES_REQUESTED" not in synthesis:
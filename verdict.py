@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Reviewer verdict parsing shared by the review CLIs and the orchestrator.
+
+Reviewers are asked to open with APPROVED or CHANGES_REQUESTED, optionally
+in bold. Only the head of the response is checked, so "APPROVED" later in a
+CHANGES_REQUESTED review doesn't count.
+"""
+
+import re
+
+APPROVED_RE = re.compile(r"\s*\**APPROVED\b", re.IGNORECASE)
+VERDICT_HEAD = 128
+
+
+def is_approved(review: str) -> bool:
+    """Whether the review opens with an APPROVED verdict."""
+    return APPROVED_RE.match(review, 0, VERDICT_HEAD) is not None
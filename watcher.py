@@ -15,6 +15,7 @@ import argparse
 import os
 import re
 import sys
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
@@ -22,8 +23,31 @@ from pathlib import Path
 import anthropic
 from dotenv import load_dotenv
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+from cache import (
+    cache_key,
+    get_cached_response,
+    get_similar_response,
+    store_response,
+    store_similar_response,
+)
+
 load_dotenv()
 
+# Seconds to wait after a change so a burst of writes is handled once
+DEBOUNCE_SECONDS = 0.2
+
+CURSOR_HEADER = b"## Cursor:"
+REVIEWER_HEADER = b"## Reviewer:"
+
+# Body of each Cursor section, up to the next section header
+LATEST_CURSOR_RE = re.compile(r'## Cursor:\s*\n(.*?)(?=## Reviewer:|## Cursor:|$)', re.DOTALL)
+
 # Reviewer system prompt
 REVIEWER_PROMPT = """You are an expert iOS code reviewer working alongside another AI developer in Cursor.
 
@@ -42,10 +66,12 @@ Remember: You're collaborating, not competing. Help make the code production-rea
 
 
 class ConversationWatcher:
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, semantic_cache: bool = False, use_cache: bool = True):
         self.filepath = Path(filepath)
         self.client = anthropic.Anthropic()
-        self.last_content = ""
+        self.semantic_cache = semantic_cache
+        self.use_cache = use_cache
+        self.last_tail = ""
         self.last_modified = 0
 
         # Create file if it doesn't exist
@@ -54,6 +80,42 @@ class ConversationWatcher:
             self.filepath.write_text(self._initial_content())
             print(f"Created conversation file: {self.filepath}")
 
+        self._set_checkpoint(self.filepath.read_bytes())
+
+    def _set_checkpoint(self, data: bytes, base: int = 0):
+        """
+        Remember where the last "## Cursor:" header in data starts.
+
+        Everything before it is settled conversation, so later checks only
+        read from there on. The marker counts for the settled part are kept
+        as running totals. data starts at byte offset base in the file.
+        """
+        start = data.rfind(CURSOR_HEADER)
+        if start == -1:
+            start = len(data)
+        if base == 0:
+            self._cursor_count = self._reviewer_count = 0
+        self._cursor_count += data.count(CURSOR_HEADER, 0, start)
+        self._reviewer_count += data.count(REVIEWER_HEADER, 0, start)
+        self._offset = base + start
+
+    def _read_tail(self) -> bytes:
+        """
+        Read the file from the checkpoint on.
+
+        If the checkpoint no longer points at a "## Cursor:" header (the
+        earlier conversation was edited or the file truncated), the whole
+        file is read and the checkpoint rebuilt from it.
+        """
+        with open(self.filepath, "rb") as f:
+            f.seek(self._offset)
+            tail = f.read()
+        if self._offset and not tail.startswith(CURSOR_HEADER):
+            data = self.filepath.read_bytes()
+            self._set_checkpoint(data)
+            tail = data[self._offset:]
+        return tail
+
     def _initial_content(self) -> str:
         return f"""# AI Collaboration Conversation
 
@@ -74,41 +136,77 @@ This file enables communication between Cursor AI and the Reviewer Agent.
     def _extract_latest_cursor_message(self, content: str) -> str | None:
         """Extract the most recent Cursor message."""
         # Find all Cursor sections
-        pattern = r'## Cursor:\s*\n(.*?)(?=## Reviewer:|## Cursor:|$)'
-        matches = re.findall(pattern, content, re.DOTALL)
+        matches = LATEST_CURSOR_RE.findall(content)
         if matches:
             return matches[-1].strip()
         return None
 
     def _count_reviewer_responses(self, content: str) -> int:
         """Count how many reviewer responses exist."""
-        return len(re.findall(r'## Reviewer:', content))
+        return content.count("## Reviewer:")
 
     def _count_cursor_messages(self, content: str) -> int:
         """Count how many cursor messages exist."""
-        return len(re.findall(r'## Cursor:', content))
+        return content.count("## Cursor:")
 
     def get_review(self, code_or_message: str) -> str:
-        """Get reviewer feedback for the given content."""
-        response = self.client.messages.create(
-            model=os.getenv("DEFAULT_MODEL", "claude-opus-4-6"),
+        """
+        Get reviewer feedback for the given content.
+
+        The same message reviewed again within the cache TTL is answered
+        from the local response cache. With semantic caching on, a review of
+        a near-identical earlier message is reused as well. Both lookups
+        are skipped when the watcher was started with --no-cache.
+        """
+        model = os.getenv("DEFAULT_MODEL", "claude-opus-4-6")
+        prompt = f"Review this from the Cursor AI:\n\n{code_or_message}"
+        key = cache_key(model, REVIEWER_PROMPT, prompt)
+        cached = get_cached_response(key) if self.use_cache else None
+        if cached is not None:
+            print("Reusing cached review of the same message")
+            return cached
+        if self.semantic_cache and self.use_cache:
+            cached = get_similar_response(model, REVIEWER_PROMPT, code_or_message)
+            if cached is not None:
+                print("Reusing review of a near-identical message")
+                return cached
+
+        # Stream to the console so progress is visible before the file is updated
+        with self.client.messages.stream(
+            model=model,
             max_tokens=2048,
             temperature=0.2,
             system=REVIEWER_PROMPT,
             messages=[{
                 "role": "user",
-                "content": f"Review this from the Cursor AI:\n\n{code_or_message}"
+                "content": prompt
             }]
-        )
-        return response.content[0].text
+        ) as response_stream:
+            for text in response_stream.text_stream:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            print()
+            review = response_stream.get_final_message().content[0].text
+        store_response(key, review)
+        if self.semantic_cache:
+            store_similar_response(model, REVIEWER_PROMPT, code_or_message, review)
+        return review
 
     def append_review(self, review: str):
         """Append reviewer response to the file."""
-        content = self.filepath.read_text()
         timestamp = datetime.now().strftime("%H:%M:%S")
-
-        new_content = content.rstrip() + f"\n\n## Reviewer: ({timestamp})\n{review}\n\n## Cursor:\n(Your response here)\n"
-        self.filepath.write_text(new_content)
+        tail = self._read_tail()
+
+        # Only the unsettled tail is rewritten; the earlier conversation stays as is
+        new_tail = (
+            tail.decode("utf-8", errors="replace").rstrip()
+            + f"\n\n## Reviewer: ({timestamp})\n{review}\n\n## Cursor:\n(Your response here)\n"
+        ).encode()
+        with open(self.filepath, "r+b") as f:
+            f.seek(self._offset)
+            f.write(new_tail)
+            f.truncate()
+        self._set_checkpoint(new_tail, base=self._offset)
 
     def check_and_respond(self) -> bool:
         """Check for new Cursor messages and respond if needed."""
@@ -118,14 +216,15 @@ This file enables communication between Cursor AI and the Reviewer Agent.
                 return False
 
             self.last_modified = stat.st_mtime
-            content = self.filepath.read_text()
+            # Only the conversation after the last settled exchange is read
+            content = self._read_tail().decode("utf-8", errors="replace")
 
-            if content == self.last_content:
+            if content == self.last_tail:
                 return False
 
             # Check if there's a new Cursor message without a Reviewer response
-            cursor_count = self._count_cursor_messages(content)
-            reviewer_count = self._count_reviewer_responses(content)
+            cursor_count = self._cursor_count + self._count_cursor_messages(content)
+            reviewer_count = self._reviewer_count + self._count_reviewer_responses(content)
 
             if cursor_count > reviewer_count:
                 latest_message = self._extract_latest_cursor_message(content)
@@ -140,21 +239,55 @@ This file enables communication between Cursor AI and the Reviewer Agent.
                     print(f"Review added! Status: {'APPROVED' if 'APPROVED' in review else 'CHANGES_REQUESTED'}")
                     return True
 
-            self.last_content = content
+            self.last_tail = content
             return False
 
         except Exception as e:
             print(f"Error: {e}")
             return False
 
+    def _wait_for_events(self):
+        """Block on OS file events (inotify/FSEvents) and respond after each burst."""
+        target = self.filepath.resolve()
+        changed = threading.Event()
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Editors that save via rename report the file as dest_path
+                paths = (event.src_path, getattr(event, "dest_path", ""))
+                if any(path and Path(path).resolve() == target for path in paths):
+                    changed.set()
+
+        observer = Observer()
+        observer.schedule(Handler(), str(target.parent))
+        observer.start()
+        try:
+            self.check_and_respond()
+            while True:
+                # Short timeout keeps Ctrl+C responsive on every platform
+                if not changed.wait(timeout=1.0):
+                    continue
+                time.sleep(DEBOUNCE_SECONDS)
+                changed.clear()
+                self.check_and_respond()
+        finally:
+            observer.stop()
+            observer.join()
+
     def watch(self, interval: float = 2.0):
-        """Watch the file for changes."""
+        """
+        Watch the file for changes.
+
+        Uses OS file events when watchdog is installed; otherwise polls
+        every interval seconds.
+        """
+        mode = "file events" if Observer is not None else f"polling every {interval}s"
         print(f"""
 ╔══════════════════════════════════════════════════════════════════╗
 ║           Cursor ↔ Reviewer Agent Communication                 ║
 ╠══════════════════════════════════════════════════════════════════╣
 ║  Watching: {str(self.filepath):<52} ║
-║  Interval: {interval}s                                              ║
+║  Mode:     {mode:<52} ║
 ╠══════════════════════════════════════════════════════════════════╣
 ║  INSTRUCTIONS:                                                   ║
 ║  1. Open the conversation file in Cursor                        ║
@@ -167,9 +300,12 @@ This file enables communication between Cursor AI and the Reviewer Agent.
 """)
 
         try:
-            while True:
-                self.check_and_respond()
-                time.sleep(interval)
+            if Observer is not None:
+                self._wait_for_events()
+            else:
+                while True:
+                    self.check_and_respond()
+                    time.sleep(interval)
         except KeyboardInterrupt:
             print("\nStopped watching.")
 
@@ -185,12 +321,18 @@ def main():
         "--interval", "-i",
         type=float,
         default=2.0,
-        help="Check interval in seconds"
+        help="Check interval in seconds when watchdog isn't installed"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always call the API, ignoring cached reviews")
+    parser.add_argument(
+        "--semantic-cache",
+        action="store_true",
+        help="Reuse reviews of near-identical earlier messages (needs sentence-transformers)"
     )
 
     args = parser.parse_args()
 
-    watcher = ConversationWatcher(args.file)
+    watcher = ConversationWatcher(args.file, semantic_cache=args.semantic_cache, use_cache=not args.no_cache)
     watcher.watch(args.interval)
 
 